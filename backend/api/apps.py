@@ -9,3 +9,11 @@ class ApiConfig(AppConfig):
         from django.contrib.auth import get_user_model
 
         get_user_model()._meta.get_field("email")._unique = True
+
+        # Invalidate cached JWT users on password changes, deactivation and logout
+        from api.authentication import invalidate_logged_out_user, invalidate_saved_user
+        from django.contrib.auth.signals import user_logged_out
+        from django.db.models.signals import post_save
+
+        post_save.connect(invalidate_saved_user, sender=get_user_model())
+        user_logged_out.connect(invalidate_logged_out_user)
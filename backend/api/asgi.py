@@ -0,0 +1,152 @@
+import asyncio
+import functools
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """ Returns the process wide thread pool running synchronous code under ASGI
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASGI_THREADS, thread_name_prefix="asgi-view"
+            )
+        return _executor
+
+
+def database_sync_to_async(func):
+    """ Wraps a synchronous function which uses the database into a coroutine function
+
+    The function is run in the thread pool returned by `get_executor`, closing the
+    thread's old database connections before and after, as request_started and
+    request_finished would under WSGI (they're sent from the event loop thread here).
+    """
+
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            get_executor(), functools.partial(run, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+async def send_http_response(send, status, body=b"", headers=()):
+    await send(
+        {"type": "http.response.start", "status": status, "headers": list(headers)}
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class ProtocolTypeRouter:
+    """ ASGI application dispatching connections to an application per scope type
+    """
+
+    def __init__(self, applications):
+        self.applications = applications
+
+    async def __call__(self, scope, receive, send):
+        try:
+            application = self.applications[scope["type"]]
+        except KeyError:
+            raise ValueError(f"No application for {scope['type']} connections")
+        await application(scope, receive, send)
+
+
+class URLRouter:
+    """ ASGI application dispatching connections to consumers by path
+
+    `routes` is a list of (regex, consumer class) pairs. Named groups of the matching
+    regex are passed to the consumer as keyword arguments. Connections to other paths
+    are passed to the `default` application if there is one, or rejected.
+    """
+
+    def __init__(self, routes, default=None):
+        self.routes = [(re.compile(regex), consumer) for regex, consumer in routes]
+        self.default = default
+
+    async def __call__(self, scope, receive, send):
+        for regex, consumer in self.routes:
+            match = regex.match(scope["path"])
+            if match:
+                await consumer(scope, **match.groupdict())(receive, send)
+                return
+        if self.default is not None:
+            await self.default(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await receive()  # websocket.connect
+            await send({"type": "websocket.close"})
+        else:
+            await send_http_response(send, 404)
+
+
+class JsonWebSocketConsumer:
+    """ Handles a WebSocket connection exchanging JSON object messages
+
+    Subclasses override `connect` (typically accepting or closing the connection),
+    `receive_json` (which otherwise closes the connection) and `disconnect`. One
+    instance handles one connection; messages which aren't JSON objects close it, and
+    messages received once it's closing are ignored.
+    """
+
+    def __init__(self, scope, **kwargs):
+        self.scope = scope
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def __call__(self, receive, send):
+        self._send = send
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.connect":
+                await self.connect()
+            elif message["type"] == "websocket.receive" and not self.closed:
+                try:
+                    content = json.loads(message.get("text") or message.get("bytes"))
+                except ValueError:
+                    content = None
+                if isinstance(content, dict):
+                    await self.receive_json(content)
+                else:
+                    await self.close(1007)
+            elif message["type"] == "websocket.disconnect":
+                await self.disconnect()
+                return
+
+    async def connect(self):
+        await self.accept()
+
+    async def disconnect(self):
+        pass
+
+    async def receive_json(self, content):
+        # Consumers not expecting messages close with "unsupported data"
+        await self.close(1003)
+
+    async def accept(self):
+        await self._send({"type": "websocket.accept"})
+
+    async def close(self, code=1000):
+        self.closed = True
+        await self._send({"type": "websocket.close", "code": code})
+
+    async def send_json(self, content):
+        await self._send({"type": "websocket.send", "text": json.dumps(content)})
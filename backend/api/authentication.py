@@ -0,0 +1,97 @@
+import jwt
+from api.caches import SharedCacheWrapper
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+from rest_framework_jwt.settings import api_settings
+
+
+def get_jwt_user_cache():
+    """ Returns the process wide JWT user cache, or None when disabled
+    """
+    return JWTUserCache.get_instance()
+
+
+def invalidate_jwt_user_cache(user_id):
+    """ Invalidates the cached users of all of a user's tokens, if caching is enabled
+    """
+    jwt_user_cache = get_jwt_user_cache()
+    if jwt_user_cache is not None:
+        jwt_user_cache.delete(user_id)
+
+
+def invalidate_saved_user(sender, instance, **kwargs):
+    invalidate_jwt_user_cache(instance.pk)
+
+
+def invalidate_logged_out_user(sender, user, **kwargs):
+    if user is not None:
+        invalidate_jwt_user_cache(user.pk)
+
+
+class JWTUserCache(SharedCacheWrapper):
+    """ Short lived cache of users resolved from JWT payloads
+
+    Users are keyed by user id and token issue time. The issue times cached for each
+    user are tracked so that all of a user's entries can be invalidated at once.
+    """
+
+    USER_KEY = "api:jwt-user:{user_id}:{issued}"
+    ISSUED_KEY = "api:jwt-user-issued:{user_id}"
+
+    setting = "API_JWT_USER_CACHE"
+    default_timeout = 60
+
+    def get(self, user_id, issued):
+        """ Returns the cached user for a token, or None
+        """
+        return self.cache.get(self.USER_KEY.format(user_id=user_id, issued=issued))
+
+    def set(self, user, issued):
+        issued_key = self.ISSUED_KEY.format(user_id=user.pk)
+        self.cache.set(issued_key, self.cache.get(issued_key, set()) | {issued})
+        self.cache.set(
+            self.USER_KEY.format(user_id=user.pk, issued=issued), user, self.timeout
+        )
+
+    def delete(self, user_id):
+        issued_key = self.ISSUED_KEY.format(user_id=user_id)
+        keys = [
+            self.USER_KEY.format(user_id=user_id, issued=issued)
+            for issued in self.cache.get(issued_key, ())
+        ]
+        self.cache.delete_many(keys + [issued_key])
+
+
+class CachedJSONWebTokenAuthentication(JSONWebTokenAuthentication):
+    """
+    JSON Web Token authentication which caches the resolved user (see JWTUserCache)
+    rather than loading it from the database on every request.
+
+    Cached users are invalidated whenever the user is saved (e.g. a password change or
+    deactivation) or logs out. See api.apps.ApiConfig.
+    """
+
+    def authenticate_credentials(self, payload):
+        jwt_user_cache = get_jwt_user_cache()
+        user_id = payload.get("user_id")
+        if jwt_user_cache is None or user_id is None:
+            return super().authenticate_credentials(payload)
+
+        # Tokens carry `orig_iat` when refresh is allowed; otherwise `exp` is a fixed
+        # offset from the issue time
+        issued = payload.get("orig_iat", payload.get("exp"))
+        user = jwt_user_cache.get(user_id, issued)
+        if user is None:
+            user = super().authenticate_credentials(payload)
+            jwt_user_cache.set(user, issued)
+        return user
+
+    def authenticate_token(self, token):
+        """ Returns the user for a token sent other than in the Authorization header (e.g.
+        over a WebSocket)
+        """
+        try:
+            payload = api_settings.JWT_DECODE_HANDLER(token)
+        except jwt.InvalidTokenError:
+            raise AuthenticationFailed()
+        return self.authenticate_credentials(payload)
@@ -0,0 +1,70 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+SHARED_CACHE_ALIAS = "shared"
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_shared_cache(alias):
+    """ Returns the cache for `alias`, which must be shared by all worker processes
+
+    Process local backends (e.g. the local-memory cache) are only accepted while a
+    single worker process serves requests (settings.WEB_CONCURRENCY).
+    """
+    cache = caches[alias]
+    if isinstance(cache, PROCESS_LOCAL_BACKENDS) and settings.WEB_CONCURRENCY > 1:
+        raise ImproperlyConfigured(
+            f"The '{alias}' cache is local to each process but WEB_CONCURRENCY is "
+            f"{settings.WEB_CONCURRENCY}; configure a shared cache backend"
+        )
+    return cache
+
+
+def get_process_instance(setting, factory):
+    """ Returns the process wide instance enabled by settings.<setting>, or None
+
+    The instance is created by calling `factory` the first time it's requested.
+    """
+    if not getattr(settings, setting):
+        return None
+    with _instances_lock:
+        if setting not in _instances:
+            _instances[setting] = factory()
+        return _instances[setting]
+
+
+class SharedCacheWrapper:
+    """ Base class of caches kept in a cache shared by all worker processes
+
+    A subclass is configured by the settings named after its `setting`: the setting
+    itself enables it, and <setting>_ALIAS and <setting>_TIMEOUT select the cache
+    alias and the timeout of its keys (see `get_instance`).
+    """
+
+    setting = None
+    default_timeout = 3600
+
+    def __init__(self, cache_alias=SHARED_CACHE_ALIAS, timeout=None):
+        self.cache = get_shared_cache(cache_alias)
+        self.timeout = self.default_timeout if timeout is None else timeout
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            cache_alias=getattr(settings, f"{cls.setting}_ALIAS"),
+            timeout=getattr(settings, f"{cls.setting}_TIMEOUT"),
+        )
+
+    @classmethod
+    def get_instance(cls):
+        """ Returns the process wide instance, or None when disabled
+        """
+        return get_process_instance(cls.setting, cls.from_settings)
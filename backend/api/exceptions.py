@@ -28,3 +28,29 @@ class UnprocessibleError(exceptions.APIException):
             detail = [detail]
 
         self.detail = exceptions._get_error_details(detail, code)
+
+
+class ConflictError(UnprocessibleError):
+    """
+    Conflict Error indicates a request could not be applied because it conflicts with
+    the current state of the target resource.
+
+    Identical to UnprocessibleError aside from setting a status of 409 instead of 422.
+    """
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _("Conflict with the current state of the resource.")
+    default_code = "conflict"
+
+
+class PreconditionFailedError(UnprocessibleError):
+    """
+    Precondition Failed Error indicates a conditional request (e.g. If-Match) did not
+    match the current state of the target resource.
+
+    Identical to UnprocessibleError aside from setting a status of 412 instead of 422.
+    """
+
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = _("Precondition failed.")
+    default_code = "precondition_failed"
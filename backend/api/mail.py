@@ -0,0 +1,131 @@
+import logging
+from datetime import timedelta
+
+from api.models import OutboundEmail
+from django.conf import settings
+from django.core import mail
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 6
+RETRY_DELAY = timedelta(minutes=1)
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+def queue_mail(subject, message, recipient_list, from_email=None):
+    """ Queues an email to be sent by the worker (see send_queued_mail)
+
+    The email is written in the current transaction so it's only sent if the
+    transaction commits.
+    """
+    return OutboundEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients="\n".join(recipient_list),
+    )
+
+
+def queue_mass_mail(datatuple):
+    """ Queues many emails with a single insert, as per django.core.mail.send_mass_mail
+
+    Each item of `datatuple` is (subject, message, from_email, recipient_list).
+    """
+    return OutboundEmail.objects.bulk_create(
+        OutboundEmail(
+            subject=subject,
+            message=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients="\n".join(recipient_list),
+        )
+        for subject, message, from_email, recipient_list in datatuple
+    )
+
+
+def queue_mail_admins(subject, message):
+    """ Queues an email to the site admins, as per django.core.mail.mail_admins
+    """
+    if not settings.ADMINS:
+        return None
+    return queue_mail(
+        subject=f"{settings.EMAIL_SUBJECT_PREFIX}{subject}",
+        message=message,
+        recipient_list=[email for name, email in settings.ADMINS],
+        from_email=settings.SERVER_EMAIL,
+    )
+
+
+def retry_delay(attempts):
+    """ Returns the exponential backoff before retrying after `attempts` failures
+    """
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def send_queued_mail(batch_size=100, connection=None):
+    """ Sends the queued emails that are due, returning the number sent and failed
+
+    Emails are sent in batches over a single email connection. Failed emails are
+    retried with exponential backoff up to MAX_ATTEMPTS times. Rows are locked while
+    they are sent (where supported) so concurrent workers skip each other's batches.
+    """
+    connection = connection or mail.get_connection()
+    sent = failed = 0
+    with connection:
+        while True:
+            batch_sent, batch_failed = _send_batch(connection, batch_size)
+            sent += batch_sent
+            failed += batch_failed
+            if batch_sent + batch_failed < batch_size:
+                return sent, failed
+
+
+def _send_batch(connection, batch_size):
+    sent = failed = 0
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=OutboundEmail.STATUS_PENDING,
+                next_attempt_time__lte=timezone.now(),
+            )
+            .order_by("next_attempt_time")[:batch_size]
+        )
+        for email in emails:
+            email.attempts += 1
+            email.modified_date = timezone.now()
+            try:
+                mail.EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=email.recipient_list,
+                    connection=connection,
+                ).send()
+            except Exception as e:
+                logger.exception("Error sending queued email %s", email.pk)
+                failed += 1
+                email.last_error = repr(e)
+                if email.attempts >= MAX_ATTEMPTS:
+                    email.status = OutboundEmail.STATUS_FAILED
+                else:
+                    email.next_attempt_time = timezone.now() + retry_delay(
+                        email.attempts
+                    )
+            else:
+                sent += 1
+                email.status = OutboundEmail.STATUS_SENT
+                email.sent_time = timezone.now()
+        OutboundEmail.objects.bulk_update(
+            emails,
+            [
+                "attempts",
+                "status",
+                "next_attempt_time",
+                "sent_time",
+                "last_error",
+                "modified_date",
+            ],
+        )
+    return sent, failed
@@ -0,0 +1,123 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dailywriting.asgi import application as asgi_application
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from entries.models import Entry
+from rest_framework_jwt.settings import api_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the WSGI and ASGI handlers serving an author's latest entry under "
+        "the same concurrent load"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=50)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.get(username=options["username"])
+        entry = Entry.objects.filter(author=user).order_by("-entry_date").first()
+        if entry is None:
+            raise CommandError(f"{user.username} has no entries")
+        self.path = f"/api/entries/{user.username}/{entry.entry_date}/"
+        self.host = next(iter(settings.ALLOWED_HOSTS), "localhost").lstrip(".")
+        self.authorization = "JWT " + api_settings.JWT_ENCODE_HANDLER(
+            api_settings.JWT_PAYLOAD_HANDLER(user)
+        )
+
+        self.stdout.write(
+            f"{options['requests']} requests for {self.path} "
+            f"with {options['concurrency']} concurrent clients"
+        )
+        self.stdout.write(f"{'handler':<8} {'requests/s':>12} {'mean':>10}")
+        for name, run in (("wsgi", self.run_wsgi), ("asgi", self.run_asgi)):
+            start = time.monotonic()
+            latencies = run(options["requests"], options["concurrency"])
+            elapsed = time.monotonic() - start
+            self.stdout.write(
+                f"{name:<8} {len(latencies) / elapsed:>12.1f} "
+                f"{sum(latencies) / len(latencies) * 1000:>8.1f}ms"
+            )
+
+    def run_wsgi(self, requests, concurrency):
+        """ Serves requests from a pool of `concurrency` threads, as a threaded WSGI
+        server would
+        """
+        handler = WSGIHandler()
+
+        def start_response(status, headers):
+            if not status.startswith("200"):
+                raise CommandError(f"Unexpected response: {status}")
+
+        def request(_):
+            start = time.monotonic()
+            response = handler(
+                {
+                    "REQUEST_METHOD": "GET",
+                    "PATH_INFO": self.path,
+                    "SERVER_NAME": self.host,
+                    "SERVER_PORT": "443",
+                    "HTTP_HOST": self.host,
+                    "HTTP_AUTHORIZATION": self.authorization,
+                    "wsgi.input": io.BytesIO(),
+                    "wsgi.url_scheme": "https",
+                },
+                start_response,
+            )
+            b"".join(response)
+            response.close()
+            return time.monotonic() - start
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(request, range(requests)))
+
+    def run_asgi(self, requests, concurrency):
+        """ Serves requests from `concurrency` tasks on one event loop, as an ASGI server
+        would
+        """
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "https",
+            "path": self.path,
+            "query_string": b"",
+            "server": (self.host, 443),
+            "headers": [
+                (b"host", self.host.encode("ascii")),
+                (b"authorization", self.authorization.encode("ascii")),
+            ],
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            if message["type"] == "http.response.start" and message["status"] != 200:
+                raise CommandError(f"Unexpected response: {message['status']}")
+
+        async def client(count):
+            latencies = []
+            for _ in range(count):
+                start = time.monotonic()
+                await asgi_application(scope, receive, send)
+                latencies.append(time.monotonic() - start)
+            return latencies
+
+        async def run():
+            counts = [requests // concurrency] * concurrency
+            for i in range(requests % concurrency):
+                counts[i] += 1
+            results = await asyncio.gather(*(client(count) for count in counts))
+            return [latency for latencies in results for latency in latencies]
+
+        return asyncio.new_event_loop().run_until_complete(run())
@@ -0,0 +1,97 @@
+import timeit
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import path
+
+# The middleware stack before API requests took the slim path (see api.middleware)
+FULL_MIDDLEWARE = [
+    "raven.contrib.django.raven_compat.middleware.Sentry404CatchMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "raven.contrib.django.raven_compat.middleware.SentryResponseErrorIdMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+# The same stack with the session based middleware skipped for slim requests
+SLIM_MIDDLEWARE = [
+    "raven.contrib.django.raven_compat.middleware.Sentry404CatchMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "raven.contrib.django.raven_compat.middleware.SentryResponseErrorIdMiddleware",
+    "api.middleware.SiteSessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "api.middleware.SiteCsrfViewMiddleware",
+    "api.middleware.SiteAuthenticationMiddleware",
+    "api.middleware.SiteMessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+SLIM_MIDDLEWARE_PATHS = ["/api/"]
+SLIM_MIDDLEWARE_EXCLUDED_PATHS = ["/api/auth/"]
+
+
+def benchmark_view(request):
+    return HttpResponse("")
+
+
+urlpatterns = [
+    path("api/benchmark/", benchmark_view),
+    path("admin/benchmark/", benchmark_view),
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmarks per-request middleware overhead of API and site requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=10000)
+
+    def get_handler(self, middleware):
+        with override_settings(MIDDLEWARE=middleware):
+            handler = BaseHandler()
+            handler.load_middleware()
+        return handler
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+
+        handlers = (
+            self.get_handler(FULL_MIDDLEWARE),
+            self.get_handler(SLIM_MIDDLEWARE),
+        )
+        factory = RequestFactory(
+            SERVER_NAME=next(iter(settings.ALLOWED_HOSTS), "localhost").lstrip(".")
+        )
+
+        self.stdout.write(f"{'path':<18} {'before':>10} {'after':>10}")
+        with override_settings(
+            SLIM_MIDDLEWARE_PATHS=SLIM_MIDDLEWARE_PATHS,
+            SLIM_MIDDLEWARE_EXCLUDED_PATHS=SLIM_MIDDLEWARE_EXCLUDED_PATHS,
+        ):
+            for request_path in ("/api/benchmark/", "/admin/benchmark/"):
+                self.benchmark_path(factory, handlers, request_path, repeat)
+
+    def benchmark_path(self, factory, handlers, request_path, repeat):
+        timings = []
+        for handler in handlers:
+
+            def get_response():
+                request = factory.get(
+                    request_path, secure=True, HTTP_AUTHORIZATION="JWT token"
+                )
+                request.urlconf = __name__
+                return handler.get_response(request)
+
+            timings.append(timeit.timeit(get_response, number=repeat))
+        self.stdout.write(
+            f"{request_path:<18} "
+            + " ".join(f"{t / repeat * 1000000:>8.1f}us" for t in timings)
+        )
@@ -0,0 +1,44 @@
+import logging
+import time
+
+from api.mail import send_queued_mail
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from users.invites import run_invite_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the background worker: runs queued invite jobs and sends queued "
+        "transactional emails, polling until stopped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run invite jobs and send due emails once then exit",
+        )
+        parser.add_argument("--interval", type=float, default=5)
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                run_invite_jobs()
+            except Exception:
+                logger.exception("Error running invite jobs")
+            try:
+                sent, failed = send_queued_mail(batch_size=options["batch_size"])
+            except Exception:
+                # e.g. the email backend is unavailable; try again next interval
+                logger.exception("Error sending queued emails")
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed")
+            if options["once"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+
+
+def is_slim_request(request):
+    """ Whether a request takes the slim middleware stack
+
+    Requests under one of settings.SLIM_MIDDLEWARE_PATHS, other than those under one of
+    settings.SLIM_MIDDLEWARE_EXCLUDED_PATHS, are slim.
+    """
+    path = request.path_info
+    return path.startswith(tuple(settings.SLIM_MIDDLEWARE_PATHS)) and not (
+        path.startswith(tuple(settings.SLIM_MIDDLEWARE_EXCLUDED_PATHS))
+    )
+
+
+class SiteOnlyMiddlewareMixin:
+    """
+    Runs a middleware for site requests only and passes slim requests (see
+    `is_slim_request`) straight through to the next middleware.
+    """
+
+    def __call__(self, request):
+        if is_slim_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SiteSessionMiddleware(SiteOnlyMiddlewareMixin, SessionMiddleware):
+    pass
+
+
+class SiteCsrfViewMiddleware(SiteOnlyMiddlewareMixin, CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_slim_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class SiteAuthenticationMiddleware(SiteOnlyMiddlewareMixin, AuthenticationMiddleware):
+    pass
+
+
+class SiteMessageMiddleware(SiteOnlyMiddlewareMixin, MessageMiddleware):
+    pass
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class BaseModel(models.Model):
@@ -7,3 +8,39 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutboundEmail(BaseModel):
+    """ A transactional email queued for sending (see api.mail)
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.TextField(help_text="One email address per line")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_time = models.DateTimeField(default=timezone.now)
+    sent_time = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_time"])]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+    @property
+    def recipient_list(self):
+        return self.recipients.splitlines()
@@ -0,0 +1,86 @@
+from api.authentication import CachedJSONWebTokenAuthentication, get_jwt_user_cache
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.test import TestCase, override_settings
+from entries.views import EntryViewSet
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_jwt.settings import api_settings
+
+UserModel = get_user_model()
+
+
+@override_settings(API_JWT_USER_CACHE=True)
+class TestCachedJSONWebTokenAuthentication(TestCase):
+    """ Unit tests for CachedJSONWebTokenAuthentication
+    """
+
+    def setUp(self):
+        self.addCleanup(get_jwt_user_cache().cache.clear)
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.token = api_settings.JWT_ENCODE_HANDLER(
+            api_settings.JWT_PAYLOAD_HANDLER(self.test_user)
+        )
+        self.authentication = CachedJSONWebTokenAuthentication()
+
+    def get_request(self, path="/"):
+        return APIRequestFactory().get(path, HTTP_AUTHORIZATION=f"JWT {self.token}")
+
+    def test_authenticate_cached(self):
+        """ Users resolved from a token are cached
+        """
+        with self.assertNumQueries(1):
+            user, token = self.authentication.authenticate(self.get_request())
+        self.assertEqual(user, self.test_user)
+
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate(self.get_request())
+        self.assertEqual(user, self.test_user)
+
+    def test_authenticate_user_saved(self):
+        """ Saving a user, e.g. deactivating them, invalidates their cached user
+        """
+        self.authentication.authenticate(self.get_request())
+        self.test_user.is_active = False
+        self.test_user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.get_request())
+
+    def test_authenticate_user_logged_out(self):
+        """ Logging out invalidates the user's cached user
+        """
+        self.authentication.authenticate(self.get_request())
+        user_logged_out.send(
+            sender=UserModel, request=self.get_request(), user=self.test_user
+        )
+
+        with self.assertNumQueries(1):
+            self.authentication.authenticate(self.get_request())
+
+    @override_settings(API_JWT_USER_CACHE=False)
+    def test_authenticate_cache_disabled(self):
+        """ Users are loaded on every request when the cache is disabled
+        """
+        self.authentication.authenticate(self.get_request())
+
+        with self.assertNumQueries(1):
+            self.authentication.authenticate(self.get_request())
+
+    def test_authenticate_permissions(self):
+        """ Ownership permissions of cached users don't query the user
+        """
+        self.authentication.authenticate(self.get_request())
+        view = EntryViewSet.as_view({"get": "list"})
+
+        # The list validators and page of entries only
+        with self.assertNumQueries(2):
+            response = view(
+                self.get_request(f"/entries/{self.test_user.username}/"),
+                username=self.test_user.username,
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
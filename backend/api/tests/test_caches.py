@@ -0,0 +1,44 @@
+from api.caches import SharedCacheWrapper, get_process_instance
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+
+class ExampleCache(SharedCacheWrapper):
+    setting = "EXAMPLE_CACHE"
+
+
+@override_settings(EXAMPLE_CACHE_ALIAS="shared", EXAMPLE_CACHE_TIMEOUT=5)
+class TestSharedCacheWrapper(SimpleTestCase):
+    """ Unit tests for the shared cache wrapper base class
+    """
+
+    def test_get_instance(self):
+        """ The process wide instance is configured from settings and None when disabled
+        """
+        with override_settings(EXAMPLE_CACHE=False):
+            self.assertIsNone(ExampleCache.get_instance())
+        with override_settings(EXAMPLE_CACHE=True):
+            example_cache = ExampleCache.get_instance()
+
+            self.assertIsInstance(example_cache, ExampleCache)
+            self.assertIs(ExampleCache.get_instance(), example_cache)
+            self.assertEqual(example_cache.timeout, 5)
+
+    @override_settings(WEB_CONCURRENCY=2)
+    def test_process_local_cache(self):
+        """ A local-memory cache is refused when several worker processes serve requests
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            ExampleCache()
+
+
+class TestGetProcessInstance(SimpleTestCase):
+    def test_get_process_instance(self):
+        """ The factory is only called once per setting, and None is returned when disabled
+        """
+        with override_settings(EXAMPLE_INSTANCE=False):
+            self.assertIsNone(get_process_instance("EXAMPLE_INSTANCE", object))
+        with override_settings(EXAMPLE_INSTANCE=True):
+            instance = get_process_instance("EXAMPLE_INSTANCE", object)
+
+            self.assertIs(get_process_instance("EXAMPLE_INSTANCE", object), instance)
@@ -1,6 +1,10 @@
 from unittest import TestCase
 
-from api.exceptions import UnprocessibleError
+from api.exceptions import (
+    ConflictError,
+    PreconditionFailedError,
+    UnprocessibleError,
+)
 from rest_framework import status
 
 
@@ -25,3 +29,36 @@ class TestUnprocessibleError(TestCase):
         self.assertEqual(ue.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
         self.assertEqual(str(ue.detail[0]), error_info)
         self.assertEqual(ue.detail[0].code, error_code)
+
+
+class TestConflictError(TestCase):
+    """ Unit tests for ConflictError custom APIException
+    """
+
+    def test_conflict_error_defaults(self):
+        """ Conflict errors include a status of 409 with default info message and code
+        """
+        ce = ConflictError()
+        self.assertEqual(ce.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(str(ce.detail[0]), ConflictError.default_detail)
+        self.assertEqual(ce.detail[0].code, ConflictError.default_code)
+
+    def test_conflict_error_with_dict_detail(self):
+        """ Conflict errors accept field keyed error info
+        """
+        ce = ConflictError({"base_digest": "error info"})
+        self.assertEqual(ce.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(str(ce.detail["base_digest"]), "error info")
+
+
+class TestPreconditionFailedError(TestCase):
+    """ Unit tests for PreconditionFailedError custom APIException
+    """
+
+    def test_precondition_failed_error_defaults(self):
+        """ Precondition failed errors include a status of 412 with default info message and code
+        """
+        pfe = PreconditionFailedError()
+        self.assertEqual(pfe.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(str(pfe.detail[0]), PreconditionFailedError.default_detail)
+        self.assertEqual(pfe.detail[0].code, PreconditionFailedError.default_code)
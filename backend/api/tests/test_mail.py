@@ -0,0 +1,107 @@
+from datetime import timedelta
+from unittest import mock
+
+from api.mail import (
+    MAX_ATTEMPTS,
+    queue_mail,
+    queue_mail_admins,
+    retry_delay,
+    send_queued_mail,
+)
+from api.models import OutboundEmail
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+
+class TestOutbox(TestCase):
+    """ Unit tests for the transactional email outbox
+    """
+
+    def test_queue_mail(self):
+        """ Queued emails are stored rather than sent
+        """
+        email = queue_mail("Subject", "Message", ["a@test.com", "b@test.com"])
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(email.recipient_list, ["a@test.com", "b@test.com"])
+
+    @override_settings(ADMINS=[("Admin", "admin@test.com")])
+    def test_queue_mail_admins(self):
+        email = queue_mail_admins("Subject", "Message")
+
+        self.assertEqual(email.recipient_list, ["admin@test.com"])
+        self.assertTrue(email.subject.endswith("Subject"))
+
+    @override_settings(ADMINS=[])
+    def test_queue_mail_admins_no_admins(self):
+        self.assertIsNone(queue_mail_admins("Subject", "Message"))
+
+    def test_send_queued_mail(self):
+        """ Due emails are sent over a single connection and marked as sent
+        """
+        for i in range(3):
+            queue_mail(f"Subject {i}", "Message", ["a@test.com"])
+        queue_mail("Later", "Message", ["a@test.com"])
+        OutboundEmail.objects.filter(subject="Later").update(
+            next_attempt_time=timezone.now() + timedelta(hours=1)
+        )
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open"
+        ) as mock_open:
+            self.assertEqual(send_queued_mail(batch_size=2), (3, 0))
+
+        mock_open.assert_called_once()
+        self.assertEqual(
+            [message.subject for message in mail.outbox],
+            ["Subject 0", "Subject 1", "Subject 2"],
+        )
+        self.assertEqual(
+            OutboundEmail.objects.filter(status=OutboundEmail.STATUS_SENT).count(), 3
+        )
+
+    def test_send_queued_mail_error(self):
+        """ Failed emails are retried with backoff and eventually marked as failed
+        """
+        email = queue_mail("Subject", "Message", ["a@test.com"])
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=Exception("Unavailable"),
+        ):
+            self.assertEqual(send_queued_mail(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.next_attempt_time, timezone.now())
+            self.assertIn("Unavailable", email.last_error)
+
+            # Not due until the retry delay has passed
+            self.assertEqual(send_queued_mail(), (0, 0))
+
+            for attempt in range(MAX_ATTEMPTS - 1):
+                OutboundEmail.objects.update(next_attempt_time=timezone.now())
+                send_queued_mail()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_FAILED)
+        self.assertEqual(email.attempts, MAX_ATTEMPTS)
+
+    def test_retry_delay(self):
+        self.assertEqual(retry_delay(1), timedelta(minutes=1))
+        self.assertEqual(retry_delay(3), timedelta(minutes=4))
+        self.assertEqual(retry_delay(20), timedelta(hours=1))
+
+    def test_run_worker_command(self):
+        queue_mail("Subject", "Message", ["a@test.com"])
+
+        with mock.patch(
+            "api.management.commands.run_worker.run_invite_jobs"
+        ) as run_invite_jobs:
+            call_command("run_worker", "--once", stdout=mock.Mock())
+
+        run_invite_jobs.assert_called_once_with()
+        self.assertEqual(len(mail.outbox), 1)
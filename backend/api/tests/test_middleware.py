@@ -0,0 +1,57 @@
+from api.middleware import (
+    SiteCsrfViewMiddleware,
+    SiteSessionMiddleware,
+    is_slim_request,
+)
+from api.views import empty_view
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+
+@override_settings(
+    SLIM_MIDDLEWARE_PATHS=["/api/"], SLIM_MIDDLEWARE_EXCLUDED_PATHS=["/api/auth/"]
+)
+class TestSiteOnlyMiddleware(SimpleTestCase):
+    """ Unit tests for the site only middleware
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_is_slim_request(self):
+        self.assertTrue(is_slim_request(self.factory.get("/api/entries/tester/")))
+        self.assertFalse(is_slim_request(self.factory.get("/api/auth/login/")))
+        self.assertFalse(is_slim_request(self.factory.get("/admin/")))
+
+    def test_slim_request_skipped(self):
+        """ Slim requests are passed straight through without a session
+        """
+        middleware = SiteSessionMiddleware(lambda request: HttpResponse(""))
+        request = self.factory.get("/api/entries/tester/")
+
+        response = middleware(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(request, "session"))
+
+    def test_site_request_processed(self):
+        """ Site requests are processed by the wrapped middleware
+        """
+        middleware = SiteSessionMiddleware(lambda request: HttpResponse(""))
+        request = self.factory.get("/api/auth/login/")
+
+        middleware(request)
+
+        self.assertTrue(hasattr(request, "session"))
+
+    def test_csrf_view_hook(self):
+        """ CSRF checks are skipped for slim requests only
+        """
+        middleware = SiteCsrfViewMiddleware(lambda request: HttpResponse(""))
+
+        request = self.factory.post("/api/profile/")
+        self.assertIsNone(middleware.process_view(request, empty_view, (), {}))
+
+        request = self.factory.post("/admin/")
+        response = middleware.process_view(request, empty_view, (), {})
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,39 @@
+import asyncio
+
+from api.asgi import JsonWebSocketConsumer
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase
+
+
+async def application(scope, receive, send):
+    await JsonWebSocketConsumer(scope)(receive, send)
+
+
+class TestJsonWebSocketConsumer(SimpleTestCase):
+    def converse(self, text):
+        return asyncio.get_event_loop().run_until_complete(self.converse_async(text))
+
+    async def converse_async(self, text):
+        communicator = ApplicationCommunicator(application, {"type": "websocket"})
+        await communicator.send_input({"type": "websocket.connect"})
+        accept = await communicator.receive_output(timeout=5)
+        await communicator.send_input({"type": "websocket.receive", "text": text})
+        close = await communicator.receive_output(timeout=5)
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout=5)
+        return accept, close
+
+    def test_unsupported_message(self):
+        """ Consumers not expecting messages close with unsupported data
+        """
+        accept, close = self.converse('{"type": "hello"}')
+
+        self.assertEqual(accept, {"type": "websocket.accept"})
+        self.assertEqual(close, {"type": "websocket.close", "code": 1003})
+
+    def test_invalid_message(self):
+        """ Messages which aren't JSON objects close with invalid data
+        """
+        accept, close = self.converse("[]")
+
+        self.assertEqual(close, {"type": "websocket.close", "code": 1007})
@@ -0,0 +1,41 @@
+"""
+ASGI config for dailywriting project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+"""
+
+import os
+
+import django
+from api.asgi import ProtocolTypeRouter, URLRouter, database_sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dailywriting.settings")
+
+
+class DailyWritingASGIHandler(ASGIHandler):
+    """ ASGI handler serving the same URLs, middleware and views as the WSGI handler
+
+    Connections are held by the event loop, so slow or idle clients don't occupy a
+    thread; only the view itself runs in a bounded thread pool (settings.ASGI_THREADS)
+    with per-thread database connections (see api.asgi.database_sync_to_async).
+    """
+
+    async def get_response(self, request):
+        return await database_sync_to_async(super().get_response)(request)
+
+
+django.setup(set_prefix=False)
+
+# Consumers import models, so they're routed once apps are loaded
+from entries.routing import http_routes, websocket_routes  # NOQA
+
+application = ProtocolTypeRouter(
+    {
+        "http": URLRouter(http_routes, default=DailyWritingASGIHandler()),
+        "websocket": URLRouter(websocket_routes),
+    }
+)
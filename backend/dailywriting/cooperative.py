@@ -0,0 +1,34 @@
+from gevent import monkey
+from gevent.socket import wait_read, wait_write
+from psycopg2 import OperationalError, extensions
+
+
+def is_gevent_patched():
+    """ Returns True when running in a gevent monkey patched process (e.g. gunicorn's
+    gevent worker)
+    """
+    return monkey.is_module_patched("socket")
+
+
+def patch_psycopg():
+    """ Makes psycopg2 cooperative with gevent
+
+    psycopg2 calls the wait callback whenever a query would block, which lets other
+    greenlets run while waiting on the database rather than blocking the whole worker.
+    """
+    extensions.set_wait_callback(gevent_wait_callback)
+
+
+def gevent_wait_callback(conn, timeout=None):
+    """ psycopg2 wait callback yielding to the gevent hub until the connection is ready
+    """
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise OperationalError(f"Bad result from poll: {state}")
@@ -0,0 +1,85 @@
+import os
+import threading
+
+from dailywriting.pooled_postgresql.pool import ConnectionPool, PoolTimeout
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(settings_dict, conn_params, connect):
+    """ Returns the worker process' connection pool for a database's connection params
+    """
+    key = (os.getpid(), repr(sorted(conn_params.items())))
+    with _pools_lock:
+        if key not in _pools:
+            options = settings_dict.get("POOL", {})
+            _pools[key] = ConnectionPool(
+                connect,
+                max_size=options.get("MAX_SIZE", 5),
+                timeout=options.get("TIMEOUT", 10),
+                max_lifetime=options.get("MAX_LIFETIME", 1800),
+                check_after=options.get("CHECK_AFTER", 30),
+                health_check=is_healthy,
+            )
+        return _pools[key]
+
+
+def is_healthy(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """ PostgreSQL backend sharing a bounded pool of connections per worker process
+
+    Configured with a `POOL` dictionary alongside `ENGINE` in the database settings
+    (see dailywriting.settings). Closing the connection returns it to the pool, so
+    `CONN_MAX_AGE` should be left at 0.
+    """
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(
+            self.settings_dict,
+            conn_params,
+            lambda: base.Database.connect(**conn_params),
+        )
+        try:
+            connection = self.pool.acquire()
+        except PoolTimeout as e:
+            raise base.Database.OperationalError(str(e)) from e
+
+        # As base.DatabaseWrapper, for both new and reused connections
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            self.pool.release(self.connection, reusable=self._is_reusable())
+
+    def _is_reusable(self):
+        # A connection closed inside an atomic block is still held by this wrapper
+        if self.in_atomic_block or self.connection.closed:
+            return False
+        if self.errors_occurred and not self.is_usable():
+            return False
+        status = self.connection.get_transaction_status()
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                self.connection.rollback()
+            except base.Database.Error:
+                return False
+        return True
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """ Bounded pool of database connections shared by the threads (or greenlets, under
+    gevent) of a worker process
+
+    At most `max_size` connections are open at once; `acquire` waits up to `timeout`
+    seconds for one to be released before raising PoolTimeout. Connections older than
+    `max_lifetime` seconds are closed rather than reused, and connections which have
+    been idle for `check_after` seconds are passed to `health_check` before reuse.
+    """
+
+    def __init__(
+        self,
+        connect,
+        max_size=5,
+        timeout=10,
+        max_lifetime=1800,
+        check_after=30,
+        health_check=None,
+        clock=time.monotonic,
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.health_check = health_check
+        self.clock = clock
+        self._condition = threading.Condition()
+        self._idle = []  # (connection, created, released) tuples, most recent last
+        self._created = {}  # id(connection) -> created
+        self._pending = 0  # Connections being opened
+        self.metrics = {
+            "acquired": 0,
+            "waited": 0,
+            "wait_time": 0.0,
+            "max_wait_time": 0.0,
+            "timeouts": 0,
+            "opened": 0,
+            "discarded": 0,
+        }
+
+    def stats(self):
+        """ Returns the pool's size and usage metrics
+        """
+        with self._condition:
+            return dict(
+                self.metrics,
+                size=self._size(),
+                idle=len(self._idle),
+                in_use=self._size() - len(self._idle),
+            )
+
+    def acquire(self):
+        """ Returns a usable connection, opening one if the pool has capacity
+        """
+        start = self.clock()
+        deadline = start + self.timeout
+        waited = False
+        with self._condition:
+            while not self._idle and self._size() >= self.max_size:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    self.metrics["timeouts"] += 1
+                    logger.warning(
+                        "Timed out after %ss waiting for a database connection: %s",
+                        self.timeout,
+                        self.metrics,
+                    )
+                    raise PoolTimeout(
+                        f"No database connection available within {self.timeout}s"
+                    )
+                self._condition.wait(remaining)
+                waited = True
+            self._record_acquired(self.clock() - start if waited else 0)
+            if self._idle:
+                connection, created, released = self._idle.pop()
+            else:
+                connection = None
+                self._pending += 1
+
+        if connection is not None:
+            if self._is_reusable(connection, created, released):
+                return connection
+            # Replace the connection, keeping its place in the pool
+            with self._condition:
+                del self._created[id(connection)]
+                self._pending += 1
+            self._close(connection)
+        return self._open()
+
+    def release(self, connection, reusable=True):
+        """ Returns a connection to the pool, or closes it if it isn't `reusable`
+        """
+        with self._condition:
+            created = self._created.get(id(connection))
+            if reusable and not self._is_expired(created):
+                self._idle.append((connection, created, self.clock()))
+                self._condition.notify()
+                return
+            self._created.pop(id(connection), None)
+            self._condition.notify()
+        self._close(connection)
+
+    def _size(self):
+        return len(self._created) + self._pending
+
+    def _record_acquired(self, wait_time):
+        self.metrics["acquired"] += 1
+        if wait_time:
+            self.metrics["waited"] += 1
+            self.metrics["wait_time"] += wait_time
+            self.metrics["max_wait_time"] = max(
+                self.metrics["max_wait_time"], wait_time
+            )
+
+    def _open(self):
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._pending -= 1
+            self._created[id(connection)] = self.clock()
+            self.metrics["opened"] += 1
+        return connection
+
+    def _is_expired(self, created):
+        return created is None or self.clock() - created >= self.max_lifetime
+
+    def _is_reusable(self, connection, created, released):
+        if self._is_expired(created):
+            return False
+        if self.health_check and self.clock() - released >= self.check_after:
+            try:
+                return self.health_check(connection)
+            except Exception:
+                return False
+        return True
+
+    def _close(self, connection):
+        with self._condition:
+            self.metrics["discarded"] += 1
+        try:
+            connection.close()
+        except Exception:
+            logger.exception("Error closing pooled database connection")
@@ -36,14 +36,19 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # After SecurityMiddleware to allow http->https redirects
     "raven.contrib.django.raven_compat.middleware.SentryResponseErrorIdMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "api.middleware.SiteSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",  #  Must be after Session Middleware
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "api.middleware.SiteCsrfViewMiddleware",
+    "api.middleware.SiteAuthenticationMiddleware",  #  Must be after Session Middleware
+    "api.middleware.SiteMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# API requests authenticate with JWT so skip the session based middleware (see
+# api.middleware). Auth endpoints may log in to a session so keep the full stack.
+SLIM_MIDDLEWARE_PATHS = ["/api/"]
+SLIM_MIDDLEWARE_EXCLUDED_PATHS = ["/api/auth/"]
+
 ROOT_URLCONF = "dailywriting.urls"
 
 WSGI_APPLICATION = "dailywriting.wsgi.application"
@@ -102,9 +107,17 @@ TEMPLATES = [
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_jwt.authentication.JSONWebTokenAuthentication",
+        "api.authentication.CachedJSONWebTokenAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ),
+    # Requests arrive through the Heroku router, which appends the client address to
+    # X-Forwarded-For; earlier entries are client supplied (see users.throttles)
+    "NUM_PROXIES": 1,
+    "DEFAULT_THROTTLE_RATES": {
+        # See users.views.InviteRequestView
+        "invite_request_ip": "20/hour",
+        "invite_request_email": "1/hour",
+    },
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "DEFAULT_PARSER_CLASSES": (
         "djangorestframework_camel_case.parser.CamelCaseJSONParser",
@@ -139,6 +152,59 @@ ACCOUNT_EMAIL_VERIFICATION = True
 ACCOUNT_SIGNUP_PASSWORD_ENTER_TWICE = False
 ACCOUNT_USERNAME_REQUIRED = True
 
+# Worker processes serving requests (set by Heroku, see Procfile)
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+# Caches backing the opt-in features below must be shared by all worker processes
+# (e.g. memcached) whenever WEB_CONCURRENCY > 1 (see api.caches)
+LOCMEM_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+CACHES = {
+    "default": {"BACKEND": LOCMEM_CACHE_BACKEND},
+    "shared": {
+        "BACKEND": os.environ.get("SHARED_CACHE_BACKEND", LOCMEM_CACHE_BACKEND),
+        "LOCATION": os.environ.get("SHARED_CACHE_LOCATION", "shared"),
+    },
+    "write_behind": {
+        "BACKEND": os.environ.get("WRITE_BEHIND_CACHE_BACKEND", LOCMEM_CACHE_BACKEND),
+        "LOCATION": os.environ.get("WRITE_BEHIND_CACHE_LOCATION", "write-behind"),
+    },
+}
+if CACHES["write_behind"]["BACKEND"] == LOCMEM_CACHE_BACKEND:
+    # Buffered autosaves must not be culled before they're flushed
+    CACHES["write_behind"]["OPTIONS"] = {"MAX_ENTRIES": 1000000}
+
+# Entries autosave write-behind buffer (see entries.buffers)
+ENTRIES_WRITE_BEHIND = os.environ.get("ENTRIES_WRITE_BEHIND", "False") == "True"
+ENTRIES_WRITE_BEHIND_CACHE = "write_behind"
+ENTRIES_WRITE_BEHIND_FLUSH_INTERVAL = int(
+    os.environ.get("ENTRIES_WRITE_BEHIND_FLUSH_INTERVAL", "30")
+)
+
+# Entries list page cache (see entries.caches)
+ENTRIES_LIST_CACHE = os.environ.get("ENTRIES_LIST_CACHE", "False") == "True"
+ENTRIES_LIST_CACHE_ALIAS = "shared"
+ENTRIES_LIST_CACHE_TIMEOUT = int(os.environ.get("ENTRIES_LIST_CACHE_TIMEOUT", "3600"))
+
+# Users profile cache (see users.caches)
+USERS_PROFILE_CACHE = os.environ.get("USERS_PROFILE_CACHE", "False") == "True"
+USERS_PROFILE_CACHE_ALIAS = "shared"
+# Bounds how long a profile read concurrently with a save can be served stale
+USERS_PROFILE_CACHE_TIMEOUT = int(os.environ.get("USERS_PROFILE_CACHE_TIMEOUT", "60"))
+
+# Cache of users authenticated by JWT (see api.authentication)
+API_JWT_USER_CACHE = os.environ.get("API_JWT_USER_CACHE", "False") == "True"
+API_JWT_USER_CACHE_ALIAS = "shared"
+API_JWT_USER_CACHE_TIMEOUT = int(os.environ.get("API_JWT_USER_CACHE_TIMEOUT", "60"))
+
+# Seconds an entry events token (see entries.authentication) is valid for
+ENTRIES_EVENTS_TOKEN_MAX_AGE = int(os.environ.get("ENTRIES_EVENTS_TOKEN_MAX_AGE", "60"))
+
+# Admin invite selections larger than this are run by the worker (see users.invites)
+USERS_BULK_INVITE_BACKGROUND_THRESHOLD = 200
+
+# Threads running views under ASGI (see dailywriting.asgi)
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", "20"))
+
 # Sentry 404 middleware
 IGNORABLE_404_URLS = (re.compile("/api"),)
 
@@ -154,6 +220,16 @@ except:
     SITE_BASE_URL = os.environ["SITE_BASE_URL"]
     ALLOWED_HOSTS = os.environ["ALLOWED_HOSTS"].split(",")
     DATABASES = {"default": dj_database_url.config(default=os.environ["DATABASE_URL"])}
+    # Connections per worker process; WEB_CONCURRENCY * DATABASE_POOL_SIZE should stay
+    # within the database's connection limit (see dailywriting.pooled_postgresql)
+    DATABASE_POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", "0"))
+    if DATABASE_POOL_SIZE:
+        DATABASES["default"]["ENGINE"] = "dailywriting.pooled_postgresql"
+        DATABASES["default"]["POOL"] = {
+            "MAX_SIZE": DATABASE_POOL_SIZE,
+            "TIMEOUT": int(os.environ.get("DATABASE_POOL_TIMEOUT", "10")),
+            "MAX_LIFETIME": int(os.environ.get("DATABASE_POOL_MAX_LIFETIME", "1800")),
+        }
     DEBUG = os.environ["DEBUG"] == "True"
     DEFAULT_FROM_EMAIL = os.environ["DEFAULT_FROM_EMAIL"]
     EMAIL_BACKEND = os.environ["EMAIL_BACKEND"]
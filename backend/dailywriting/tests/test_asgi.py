@@ -0,0 +1,119 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from asgiref.testing import ApplicationCommunicator
+from dailywriting.asgi import application
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+from entries.models import Entry
+from rest_framework_jwt.settings import api_settings
+
+UserModel = get_user_model()
+
+
+class TestASGIApplication(TransactionTestCase):
+    """ The ASGI application serves the same responses as the WSGI application
+
+    Views run in other threads, so this uses a TransactionTestCase for the test data to
+    be visible to them.
+    """
+
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.token = api_settings.JWT_ENCODE_HANDLER(
+            api_settings.JWT_PAYLOAD_HANDLER(self.test_user)
+        )
+        self.start_time = datetime.now(timezone.utc)
+        self.today = self.start_time.strftime("%Y-%m-%d")
+        Entry.objects.create(
+            author=self.test_user,
+            entry_date=self.today,
+            start_time=self.start_time,
+            words="My first entry",
+            word_count=3,
+            milestone_word_count=750,
+        )
+
+    def request(self, method, path, body=None):
+        return asyncio.get_event_loop().run_until_complete(
+            self.request_async(method, path, body)
+        )
+
+    async def request_async(self, method, path, body=None):
+        body = json.dumps(body).encode("utf-8") if body is not None else b""
+        communicator = ApplicationCommunicator(
+            application,
+            {
+                "type": "http",
+                "http_version": "1.1",
+                "method": method,
+                "path": path,
+                "query_string": b"",
+                "headers": [
+                    (b"host", b"testserver"),
+                    (b"authorization", f"JWT {self.token}".encode("ascii")),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                ],
+            },
+        )
+        await communicator.send_input({"type": "http.request", "body": body})
+        start = await communicator.receive_output(timeout=5)
+        response = await communicator.receive_output(timeout=5)
+        return start["status"], json.loads(response["body"])
+
+    def wsgi_request(self, method, path, body=None):
+        response = getattr(self.client, method.lower())(
+            path,
+            data=json.dumps(body) if body is not None else None,
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"JWT {self.token}",
+        )
+        return response.status_code, response.json()
+
+    def test_entry_retrieve(self):
+        path = f"/api/entries/{self.test_user.username}/{self.today}/"
+
+        status, data = self.request("GET", path)
+
+        self.assertEqual(status, 200)
+        self.assertEqual((status, data), self.wsgi_request("GET", path))
+
+    def test_entry_update(self):
+        path = f"/api/entries/{self.test_user.username}/{self.today}/"
+
+        status, data = self.request(
+            "PATCH",
+            path,
+            {
+                "author": self.test_user.username,
+                "entryDate": self.today,
+                "startTime": self.start_time.isoformat(),
+                "words": "My updated entry",
+            },
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(data["wordCount"], 3)
+        self.assertEqual(Entry.objects.get().words, "My updated entry")
+
+    def test_profile(self):
+        status, data = self.request("GET", "/api/profile/")
+
+        self.assertEqual(status, 200)
+        self.assertEqual((status, data), self.wsgi_request("GET", "/api/profile/"))
+
+    def test_concurrent_requests(self):
+        path = f"/api/entries/{self.test_user.username}/{self.today}/"
+
+        async def request_many():
+            return await asyncio.gather(
+                *(self.request_async("GET", path) for _ in range(10))
+            )
+
+        responses = asyncio.get_event_loop().run_until_complete(request_many())
+
+        self.assertEqual({status for status, data in responses}, {200})
@@ -0,0 +1,60 @@
+import importlib
+import sys
+import time
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase
+
+try:
+    import gevent
+    import psycopg2
+    from dailywriting.cooperative import patch_psycopg
+    from psycopg2 import extensions
+except ImportError:  # pragma: no cover
+    gevent = None
+
+
+@skipUnless(gevent, "Requires gevent and psycopg2")
+@skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL")
+class TestCooperativePsycopg(SimpleTestCase):
+    databases = {"default"}
+    QUERY_SECONDS = 0.5
+    CONCURRENCY = 5
+
+    def setUp(self):
+        patch_psycopg()
+        self.addCleanup(extensions.set_wait_callback, None)
+
+    def slow_query(self):
+        conn = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(%s)", [self.QUERY_SECONDS])
+        finally:
+            conn.close()
+
+    def test_concurrent_slow_queries(self):
+        """ Simultaneous slow queries on a single worker finish in around one query's time
+        """
+        start = time.monotonic()
+        greenlets = [gevent.spawn(self.slow_query) for _ in range(self.CONCURRENCY)]
+        gevent.joinall(greenlets, raise_error=True)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, self.QUERY_SECONDS * 2)
+
+
+class TestWSGIApplication(SimpleTestCase):
+    def test_loads_without_gevent(self):
+        """ The WSGI application loads without importing gevent or psycopg2 unless the
+        process was monkey patched by gevent
+        """
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop("gevent.monkey", None)
+            sys.modules.pop("dailywriting.cooperative", None)
+            sys.modules.pop("dailywriting.wsgi", None)
+            wsgi = importlib.import_module("dailywriting.wsgi")
+
+            self.assertTrue(callable(wsgi.application))
+            self.assertNotIn("dailywriting.cooperative", sys.modules)
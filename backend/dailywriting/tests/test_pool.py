@@ -0,0 +1,123 @@
+import threading
+from unittest.mock import Mock
+
+from dailywriting.pooled_postgresql.pool import ConnectionPool, PoolTimeout
+from django.test import SimpleTestCase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestConnectionPool(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.connect = Mock(side_effect=lambda: Mock(name="connection"))
+
+    def test_reuses_released_connections(self):
+        pool = ConnectionPool(self.connect, max_size=2)
+
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertEqual(pool.stats()["in_use"], 1)
+
+    def test_bounded_size_timeout(self):
+        pool = ConnectionPool(self.connect, max_size=2, timeout=0)
+        # Checked out connections stay referenced, as by their database wrappers
+        connections = [pool.acquire(), pool.acquire()]
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        self.assertEqual(self.connect.call_count, 2)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+        self.assertEqual(pool.stats()["in_use"], len(connections))
+
+    def test_waits_for_released_connection(self):
+        pool = ConnectionPool(self.connect, max_size=1, timeout=5)
+        connection = pool.acquire()
+        threading.Timer(0.05, pool.release, [connection]).start()
+
+        self.assertIs(pool.acquire(), connection)
+
+        stats = pool.stats()
+        self.assertEqual(stats["waited"], 1)
+        self.assertGreater(stats["max_wait_time"], 0)
+        self.assertEqual(stats["timeouts"], 0)
+
+    def test_max_lifetime(self):
+        pool = ConnectionPool(
+            self.connect, max_size=1, max_lifetime=60, clock=self.clock
+        )
+        connection = pool.acquire()
+        self.clock.now = 30
+        pool.release(connection)
+        self.clock.now = 61
+
+        replacement = pool.acquire()
+
+        self.assertIsNot(replacement, connection)
+        connection.close.assert_called_once_with()
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_expired_on_release(self):
+        pool = ConnectionPool(
+            self.connect, max_size=1, max_lifetime=60, clock=self.clock
+        )
+        connection = pool.acquire()
+        self.clock.now = 60
+
+        pool.release(connection)
+
+        connection.close.assert_called_once_with()
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_health_check(self):
+        health_check = Mock(return_value=False)
+        pool = ConnectionPool(
+            self.connect,
+            max_size=1,
+            check_after=30,
+            health_check=health_check,
+            clock=self.clock,
+        )
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        health_check.assert_not_called()
+        pool.release(connection)
+        self.clock.now = 30
+
+        replacement = pool.acquire()
+
+        health_check.assert_called_once_with(connection)
+        self.assertIsNot(replacement, connection)
+        connection.close.assert_called_once_with()
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+    def test_release_unusable(self):
+        pool = ConnectionPool(self.connect, max_size=1, timeout=0)
+        connection = pool.acquire()
+
+        pool.release(connection, reusable=False)
+
+        connection.close.assert_called_once_with()
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_connect_error_frees_slot(self):
+        pool = ConnectionPool(self.connect, max_size=1, timeout=0)
+        self.connect.side_effect = [Exception("Connection refused"), Mock()]
+
+        with self.assertRaises(Exception):
+            pool.acquire()
+
+        pool.acquire()
+        self.assertEqual(pool.stats()["size"], 1)
@@ -8,10 +8,20 @@ https://docs.djangoproject.com/en/1.11/howto/deployment/wsgi/
 """
 
 import os
+import sys
 
 from django.core.wsgi import get_wsgi_application
 from raven.contrib.django.raven_compat.middleware.wsgi import Sentry
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dailywriting.settings")
 
+# The gevent worker monkey patches the process before loading the application. The
+# psycopg2 driver is a C extension so it also needs patching to yield during queries.
+# Only then are gevent and psycopg2 imported, so other servers run without them.
+if "gevent.monkey" in sys.modules:
+    from dailywriting.cooperative import is_gevent_patched, patch_psycopg
+
+    if is_gevent_patched():
+        patch_psycopg()
+
 application = Sentry(get_wsgi_application())
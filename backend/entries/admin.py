@@ -5,4 +5,5 @@ from entries.models import Entry
 @admin.register(Entry)
 class EntryAdmin(admin.ModelAdmin):
     list_display = ("author", "entry_date")
+    list_select_related = ("author",)
     readonly_fields = ("word_count", "start_time", "finish_time", "milestone_time")
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signing import BadSignature, TimestampSigner
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+EVENTS_TOKEN_SALT = "entries.events"
+
+
+def issue_events_token(user):
+    """ Returns a short lived token authenticating only the user's events stream
+
+    EventSource clients can't set headers, so they send it as the `token` query
+    parameter; URLs end up in access logs, where a session JWT would stay usable for
+    days. The token expires after settings.ENTRIES_EVENTS_TOKEN_MAX_AGE seconds.
+    """
+    return TimestampSigner(salt=EVENTS_TOKEN_SALT).sign(str(user.pk))
+
+
+class EventsTokenAuthentication(BaseAuthentication):
+    """ Authentication by an events token (see issue_events_token) in a `token` query
+    parameter
+
+    Only meant for the entry events stream.
+    """
+
+    def authenticate(self, request):
+        token = request.query_params.get("token")
+        if token is None:
+            return None
+        return (self.authenticate_token(token), None)
+
+    def authenticate_token(self, token):
+        """ Returns the user for an events token
+        """
+        try:
+            user_id = TimestampSigner(salt=EVENTS_TOKEN_SALT).unsign(
+                token, max_age=settings.ENTRIES_EVENTS_TOKEN_MAX_AGE
+            )
+        except BadSignature:
+            raise AuthenticationFailed()
+        try:
+            return get_user_model().objects.get(pk=user_id, is_active=True)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed()
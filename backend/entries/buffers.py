@@ -0,0 +1,180 @@
+import atexit
+import logging
+import threading
+import time
+
+from api.caches import get_process_instance, get_shared_cache
+from django.conf import settings
+from django.db import close_old_connections
+from entries.models import Entry
+
+logger = logging.getLogger(__name__)
+
+
+def get_entry_buffer():
+    """ Returns the process wide entry write-behind buffer, or None when disabled
+    """
+    return get_process_instance("ENTRIES_WRITE_BEHIND", _create_entry_buffer)
+
+
+def _create_entry_buffer():
+    entry_buffer = EntryWriteBehindBuffer(
+        cache_alias=settings.ENTRIES_WRITE_BEHIND_CACHE,
+        flush_interval=settings.ENTRIES_WRITE_BEHIND_FLUSH_INTERVAL,
+    )
+    atexit.register(entry_buffer.flush)
+    # Drain saves left pending by processes which exited without flushing
+    entry_buffer._ensure_flusher()
+    return entry_buffer
+
+
+class EntryWriteBehindBuffer:
+    """ Write-behind buffer for entry autosaves
+
+    Autosaves are stored in a cache and acknowledged straight away. A flusher thread
+    coalesces them into a single UPDATE per entry every `flush_interval` seconds, and
+    any outstanding saves are flushed when the process exits.
+
+    Buffered values are kept in the cache after they are flushed (until
+    `BUFFER_TIMEOUT`) so that readers overlaying them never observe stale words.
+
+    The cache must be shared by all worker processes and must not evict buffered
+    values (see settings.CACHES["write_behind"]). Each process also keeps the values
+    of its own unflushed saves, so an evicted entry is still written (and logged).
+
+    The pks of unflushed entries are also recorded in a set in the cache, which every
+    process's flusher drains. Saves buffered by a process that exits without
+    flushing (e.g. when it is killed) are therefore written by the other processes,
+    or by the next process to start.
+    """
+
+    BUFFERED_FIELDS = (
+        "words",
+        "words_digest",
+        "excerpt",
+        "word_count",
+        "finish_time",
+        "milestone_time",
+        "modified_date",
+        "version",
+    )
+    BUFFER_TIMEOUT = 60 * 60 * 24
+    KEY_PREFIX = "entries:write-behind:"
+    PENDING_KEY = "entries:write-behind-pending"
+    PENDING_LOCK_KEY = "entries:write-behind-pending-lock"
+    PENDING_LOCK_TIMEOUT = 5
+
+    def __init__(self, cache_alias="write_behind", flush_interval=30):
+        self.cache = get_shared_cache(cache_alias)
+        self.flush_interval = flush_interval
+        self._dirty = {}  # pk -> values of this process' last unflushed save
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def _key(self, pk):
+        return f"{self.KEY_PREFIX}{pk}"
+
+    def put(self, entry):
+        """ Buffers the current state of an entry's autosaved fields
+        """
+        values = {field: getattr(entry, field) for field in self.BUFFERED_FIELDS}
+        self.cache.set(self._key(entry.pk), values, self.BUFFER_TIMEOUT)
+        # Checked after the values are set; see flush_entry
+        if entry.pk not in self.pending():
+            self._update_pending(add=entry.pk)
+        with self._lock:
+            self._dirty[entry.pk] = values
+            self._ensure_flusher()
+
+    def pending(self):
+        """ Returns the pks of the entries buffered by any process and not yet flushed
+        """
+        return self.cache.get(self.PENDING_KEY, set())
+
+    def _update_pending(self, add=None, remove=None):
+        # The set is read and written under a lock so updates aren't lost. The lock
+        # expires so that one held by a process which died is eventually released.
+        while not self.cache.add(
+            self.PENDING_LOCK_KEY, True, self.PENDING_LOCK_TIMEOUT
+        ):
+            time.sleep(0.01)
+        try:
+            pending = self.pending()
+            if add is not None:
+                pending.add(add)
+            if remove is not None:
+                pending.discard(remove)
+            self.cache.set(self.PENDING_KEY, pending, None)
+        finally:
+            self.cache.delete(self.PENDING_LOCK_KEY)
+
+    def get(self, pk):
+        """ Returns the buffered values of an entry, or None if it isn't buffered
+        """
+        return self.cache.get(self._key(pk))
+
+    def read_through(self, entry):
+        """ Overlays buffered values onto an entry loaded from the database
+        """
+        values = self.get(entry.pk)
+        if values:
+            for field, value in values.items():
+                setattr(entry, field, value)
+        return entry
+
+    def read_through_many(self, entries):
+        entries = list(entries)
+        buffered = self.cache.get_many([self._key(entry.pk) for entry in entries])
+        for entry in entries:
+            for field, value in buffered.get(self._key(entry.pk), {}).items():
+                setattr(entry, field, value)
+        return entries
+
+    def flush_entry(self, pk):
+        """ Writes the buffered state of an entry to the database
+        """
+        with self._lock:
+            dirty_values = self._dirty.get(pk)
+        values = self.cache.get(self._key(pk))
+        if values is None and dirty_values is not None:
+            logger.error(
+                "Buffered entry %s was evicted from the cache before it was flushed", pk
+            )
+            values = dirty_values
+        if values:
+            # Never overwrite a newer version written by a concurrent flush
+            Entry.objects.filter(pk=pk, version__lte=values["version"]).update(**values)
+        self._update_pending(remove=pk)
+        # A save buffered since the values were read may have seen the pk as still
+        # pending, so it's put back for the next flush
+        current = self.cache.get(self._key(pk))
+        if current is not None and current != values:
+            self._update_pending(add=pk)
+        with self._lock:
+            if self._dirty.get(pk) is dirty_values:
+                self._dirty.pop(pk, None)
+
+    def flush(self):
+        """ Writes all buffered entries to the database, including those buffered by
+        other processes
+        """
+        with self._lock:
+            dirty = set(self._dirty)
+        for pk in sorted(dirty | self.pending()):
+            try:
+                self.flush_entry(pk)
+            except Exception:
+                logger.exception("Error flushing buffered entry %s", pk)
+
+    def _ensure_flusher(self):
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="entry-write-behind", daemon=True
+            )
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            close_old_connections()
@@ -0,0 +1,74 @@
+import hashlib
+import time
+
+from api.caches import SharedCacheWrapper
+
+
+def get_entry_list_cache():
+    """ Returns the process wide entry list cache, or None when disabled
+    """
+    return EntryListCache.get_instance()
+
+
+def invalidate_entry_list_cache(author_id):
+    """ Invalidates the cached entry list pages of an author, if caching is enabled
+    """
+    entry_list_cache = get_entry_list_cache()
+    if entry_list_cache is not None:
+        entry_list_cache.bump_generation(author_id)
+
+
+class EntryListCache(SharedCacheWrapper):
+    """ Cache of rendered entry list pages
+
+    Page keys include a per-author generation counter which is bumped whenever one of
+    the author's entries is saved. Invalidation is a single increment and stale pages
+    simply expire.
+    """
+
+    setting = "ENTRIES_LIST_CACHE"
+
+    GENERATION_KEY = "entries:list-generation:{author_id}"
+    PAGE_KEY = "entries:list:{author_id}:{generation}:{path_digest}"
+
+    def generation(self, author_id):
+        """ Returns the current generation of an author's entry list pages
+        """
+        key = self.GENERATION_KEY.format(author_id=author_id)
+        generation = self.cache.get(key)
+        if generation is None:
+            # Start from the clock so an evicted counter never reuses a past generation
+            self.cache.add(key, time.time_ns(), None)
+            generation = self.cache.get(key)
+        return generation
+
+    def bump_generation(self, author_id):
+        key = self.GENERATION_KEY.format(author_id=author_id)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, time.time_ns(), None)
+
+    def _page_key(self, author_id, generation, path):
+        return self.PAGE_KEY.format(
+            author_id=author_id,
+            generation=generation,
+            path_digest=hashlib.sha1(path.encode("utf-8")).hexdigest(),
+        )
+
+    def get(self, author_id, generation, path):
+        """ Returns the cached (content, content_type) of a page, or None
+
+        `path` identifies the page within the author's list and should include
+        anything the representation varies on (query string, media type).
+        """
+        return self.cache.get(self._page_key(author_id, generation, path))
+
+    def set(self, author_id, generation, path, response):
+        """ Caches a rendered page
+        """
+        self.cache.set(
+            self._page_key(author_id, generation, path),
+            (response.content, response["Content-Type"]),
+            self.timeout,
+        )
@@ -0,0 +1,248 @@
+import asyncio
+from urllib.parse import parse_qs
+
+from api.asgi import JsonWebSocketConsumer, database_sync_to_async, send_http_response
+from api.authentication import CachedJSONWebTokenAuthentication
+from api.exceptions import ConflictError, PreconditionFailedError
+from django.utils.dateparse import parse_date
+from django.utils.translation import gettext_lazy as _
+from djangorestframework_camel_case.util import camelize, underscoreize
+from entries.authentication import EventsTokenAuthentication
+from entries.buffers import get_entry_buffer
+from entries.events import (
+    HEARTBEAT,
+    HEARTBEAT_INTERVAL,
+    format_event,
+    get_event_broker,
+)
+from entries.models import Entry
+from entries.serializers import EntryAutosaveSerializer, EntrySerializer
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotAuthenticated,
+    NotFound,
+    PermissionDenied,
+)
+
+
+class EntryAutosaveConsumer(JsonWebSocketConsumer):
+    """ Autosave channel for an author's entry
+
+    The client authenticates once, with `{"type": "authenticate", "token": <JWT>}` as
+    its first message, and is authorized as the entry's author (as IsOwnerByUsername
+    and IsEntryAuthor). It may then stream saves of either the full `words` or `edits`
+    with a `baseDigest` (as a PATCH to the entry), each optionally carrying an `id`:
+
+        {"type": "save", "id": 1, "words": "..."}
+
+    Each save is answered with `{"type": "ack", "id": 1, "entry": {...}}` carrying the
+    entry's minimal fields (see EntrySerializer.Meta.minimal_fields), or with
+    `{"type": "error", "id": 1, "status": 422, "errors": {...}}` carrying the status
+    and errors the REST API would respond with.
+
+    The entry is reloaded for each save, as it may also be modified through the REST
+    API or another channel. Edits apply only to the words they were made against (see
+    `baseDigest`) and full words only over the version the channel last acknowledged.
+    Conflicting saves are answered with a 409 error also carrying the entry, from which
+    the client carries on.
+
+    Connections failing to authenticate, or not authenticating within
+    AUTHENTICATION_TIMEOUT seconds, are closed with code 4001, those not authorized
+    with 4003 and those for a missing entry (or invalid date) with 4004. Clients fall
+    back to the REST API (e.g. to upsert today's entry before reconnecting).
+    """
+
+    AUTHENTICATION_TIMEOUT = 10
+    CLOSE_CODES = {AuthenticationFailed: 4001, PermissionDenied: 4003, NotFound: 4004}
+
+    def __init__(self, scope, username, entry_date):
+        super().__init__(scope)
+        self.username = username
+        try:
+            self.entry_date = parse_date(entry_date)
+        except ValueError:
+            self.entry_date = None
+        self.entry = None
+        self.authentication_timeout = None
+
+    async def connect(self):
+        await self.accept()
+        if self.entry_date is None:
+            await self.close(self.CLOSE_CODES[NotFound])
+        else:
+            self.authentication_timeout = asyncio.ensure_future(
+                self.close_unauthenticated()
+            )
+
+    async def disconnect(self):
+        if self.authentication_timeout is not None:
+            self.authentication_timeout.cancel()
+
+    async def close_unauthenticated(self):
+        await asyncio.sleep(self.AUTHENTICATION_TIMEOUT)
+        if self.entry is None and not self.closed:
+            await self.close(self.CLOSE_CODES[AuthenticationFailed])
+
+    async def receive_json(self, content):
+        if self.entry is None:
+            await self.authenticate(content)
+        elif content.get("type") == "save":
+            await self.save(content)
+
+    async def authenticate(self, content):
+        try:
+            if content.get("type") != "authenticate":
+                raise AuthenticationFailed()
+            self.entry = await database_sync_to_async(self.get_entry)(
+                str(content.get("token"))
+            )
+        except tuple(self.CLOSE_CODES) as exc:
+            await self.close(self.CLOSE_CODES[type(exc)])
+        else:
+            self.authentication_timeout.cancel()
+            await self.send_json({"type": "ready", "entry": self.represent()})
+
+    async def save(self, content):
+        try:
+            await database_sync_to_async(self.save_entry)(content)
+        except APIException as exc:
+            error = {
+                "type": "error",
+                "id": content.get("id"),
+                "status": exc.status_code,
+                "errors": camelize(exc.detail),
+            }
+            if isinstance(exc, ConflictError):
+                error["entry"] = self.represent()
+            await self.send_json(error)
+        else:
+            await self.send_json(
+                {"type": "ack", "id": content.get("id"), "entry": self.represent()}
+            )
+
+    def get_entry(self, token):
+        user = CachedJSONWebTokenAuthentication().authenticate_token(token)
+        if user.username != self.username:
+            raise PermissionDenied()
+        return self.load_entry(user)
+
+    def load_entry(self, author):
+        try:
+            entry = (
+                Entry.objects.with_words()
+                .select_related("author")
+                .get(author=author, entry_date=self.entry_date)
+            )
+        except Entry.DoesNotExist:
+            raise NotFound()
+        entry_buffer = get_entry_buffer()
+        if entry_buffer is not None:
+            entry_buffer.read_through(entry)
+        return entry
+
+    def save_entry(self, content):
+        version = self.entry.version
+        self.entry = self.load_entry(self.entry.author)
+        context = {"entry_buffer": get_entry_buffer()}
+        if "edits" not in content:
+            context["if_match"] = [version]
+        serializer = EntryAutosaveSerializer(
+            self.entry, data=underscoreize(content), partial=True, context=context
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            self.entry = serializer.save()
+        except PreconditionFailedError:
+            raise ConflictError({"version": _("Entry has been modified")})
+
+    def represent(self):
+        serializer = EntrySerializer(
+            self.entry, context={"fields": EntrySerializer.Meta.minimal_fields}
+        )
+        return camelize(serializer.data)
+
+
+class EntryEventsConsumer:
+    """ Server-sent events stream of an author's entry events under ASGI
+
+    The ASGI counterpart of entries.views.EntryEventsView: the stream waits for events
+    on the event loop rather than holding a thread. Authenticates with either a JWT in
+    the Authorization header or an events token (see entries.authentication) in a
+    `token` query parameter.
+    """
+
+    def __init__(self, scope, username):
+        self.scope = scope
+        self.username = username
+
+    def get_user(self):
+        headers = dict(self.scope["headers"])
+        prefix, _, token = (
+            headers.get(b"authorization", b"").decode("latin1").partition(" ")
+        )
+        if prefix.lower() == "jwt" and token:
+            return CachedJSONWebTokenAuthentication().authenticate_token(token)
+        query = parse_qs(self.scope["query_string"].decode("latin1"))
+        if "token" in query:
+            return EventsTokenAuthentication().authenticate_token(query["token"][0])
+        raise NotAuthenticated()
+
+    def get_author(self):
+        user = self.get_user()
+        if user.username != self.username:
+            raise PermissionDenied()
+        return user
+
+    async def __call__(self, receive, send):
+        await receive()  # http.request
+        try:
+            author = await database_sync_to_async(self.get_author)()
+        except APIException as exc:
+            await send_http_response(
+                send,
+                exc.status_code,
+                format_event("error", {"detail": exc.detail}),
+                [(b"content-type", b"text/event-stream")],
+            )
+            return
+
+        loop = asyncio.get_event_loop()
+        events = asyncio.Queue()
+
+        def deliver(event, data):
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+        broker = get_event_broker()
+        broker.subscribe(author.pk, deliver)
+        disconnect = asyncio.ensure_future(receive())
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/event-stream"),
+                        (b"cache-control", b"no-cache"),
+                    ],
+                }
+            )
+            while not disconnect.done():
+                event = asyncio.ensure_future(events.get())
+                await asyncio.wait(
+                    {event, disconnect},
+                    timeout=HEARTBEAT_INTERVAL,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if event.done():
+                    body = format_event(*event.result())
+                else:
+                    event.cancel()
+                    body = HEARTBEAT
+                if not disconnect.done():
+                    await send(
+                        {"type": "http.response.body", "body": body, "more_body": True}
+                    )
+        finally:
+            broker.unsubscribe(author.pk, deliver)
+            disconnect.cancel()
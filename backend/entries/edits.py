@@ -0,0 +1,35 @@
+import hashlib
+
+
+def words_digest(words):
+    """ Returns the hex SHA-256 digest identifying a revision of an entry's words
+
+    A missing (None) text is treated as empty so that new entries have a stable base.
+    """
+    return hashlib.sha256((words or "").encode("utf-8")).hexdigest()
+
+
+def apply_edits(words, edits):
+    """ Applies a list of text edit operations to words and returns the result
+
+    Each edit is a mapping of `position`, `delete` and `insert`: `delete` characters
+    are removed starting at `position` and then `insert` is placed at `position`.
+    Edits are applied in order, each against the text produced by the previous edit.
+
+    Positions and lengths count UTF-16 code units, as JavaScript string indices do,
+    so characters outside the Basic Multilingual Plane (e.g. emoji) count as two.
+
+    Raises ValueError when an edit falls outside the bounds of the text, or when the
+    result splits such a character.
+    """
+    units = (words or "").encode("utf-16-le")
+    for index, edit in enumerate(edits):
+        start = edit["position"] * 2
+        end = start + edit.get("delete", 0) * 2
+        if start < 0 or end < start or end > len(units):
+            raise ValueError(f"Edit {index} is out of range")
+        units = units[:start] + edit.get("insert", "").encode("utf-16-le") + units[end:]
+    try:
+        return units.decode("utf-16-le")
+    except UnicodeDecodeError:
+        raise ValueError("Edits split a character")
@@ -0,0 +1,115 @@
+import json
+import queue
+import threading
+from collections import defaultdict
+
+from django.db import close_old_connections, transaction
+from djangorestframework_camel_case.util import camelize
+
+ENTRY_UPDATED = "entry_updated"
+MILESTONE_REACHED = "milestone_reached"
+
+# Sent when there are no events, so proxies keep the stream open
+HEARTBEAT = b": heartbeat\n\n"
+HEARTBEAT_INTERVAL = 15
+
+_event_broker = None
+_event_broker_lock = threading.Lock()
+
+
+def get_event_broker():
+    """ Returns the process wide entry event broker
+    """
+    global _event_broker
+    with _event_broker_lock:
+        if _event_broker is None:
+            _event_broker = EventBroker()
+        return _event_broker
+
+
+def publish_entry_events(entry, milestone_reached=False):
+    """ Publishes an entry's events to its author's subscribers once the current
+    transaction commits
+    """
+    data = {
+        "entry_date": entry.entry_date.isoformat(),
+        "version": entry.version,
+        "word_count": entry.word_count,
+    }
+    events = [(ENTRY_UPDATED, data)]
+    if milestone_reached:
+        events.append(
+            (
+                MILESTONE_REACHED,
+                dict(data, milestone_time=entry.milestone_time.isoformat()),
+            )
+        )
+
+    def publish():
+        broker = get_event_broker()
+        for event, event_data in events:
+            broker.publish(entry.author_id, event, event_data)
+
+    transaction.on_commit(publish)
+
+
+def format_event(event, data):
+    """ Returns an event in the server-sent events format
+    """
+    return f"event: {event}\ndata: {json.dumps(camelize(data))}\n\n".encode("utf-8")
+
+
+def stream_events(author_id):
+    """ Yields an author's events in the server-sent events format, and heartbeats
+
+    Intended for a StreamingHttpResponse: the generator blocks between events, which
+    gevent workers turn into a cooperative wait.
+    """
+    # The stream outlives the request's database use, so don't hold a connection
+    close_old_connections()
+    events = queue.Queue()
+    broker = get_event_broker()
+
+    def deliver(event, data):
+        events.put((event, data))
+
+    broker.subscribe(author_id, deliver)
+    try:
+        while True:
+            try:
+                yield format_event(*events.get(timeout=HEARTBEAT_INTERVAL))
+            except queue.Empty:
+                yield HEARTBEAT
+    finally:
+        broker.unsubscribe(author_id, deliver)
+
+
+class EventBroker:
+    """ In-process fan-out of entry events to the subscribers of their author
+
+    Subscribers register a `deliver(event, data)` callable which must not block; it's
+    called from whichever thread publishes the event. Only subscribers in the same
+    process receive events, so each worker process streams the events of the saves
+    it handles itself.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, author_id, deliver):
+        with self._lock:
+            self._subscribers[author_id].add(deliver)
+
+    def unsubscribe(self, author_id, deliver):
+        with self._lock:
+            subscribers = self._subscribers[author_id]
+            subscribers.discard(deliver)
+            if not subscribers:
+                del self._subscribers[author_id]
+
+    def publish(self, author_id, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(author_id, ()))
+        for deliver in subscribers:
+            deliver(event, data)
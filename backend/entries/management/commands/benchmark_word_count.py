@@ -0,0 +1,67 @@
+import random
+import re
+import timeit
+
+from django.core.management.base import BaseCommand
+from entries.word_count import _count_paragraph_words, count_words
+
+VOCABULARY = (
+    "the quick brown fox jumps over lazy dog writing daily habit page morning "
+    "coffee notebook idea sentence paragraph café naïve don't re-read"
+).split()
+
+
+def generate_entry(word_count, words_per_paragraph=80, seed=0):
+    """ Generates an entry of roughly `word_count` words split into paragraphs
+    """
+    rng = random.Random(seed)
+    paragraphs = []
+    for start in range(0, word_count, words_per_paragraph):
+        size = min(words_per_paragraph, word_count - start)
+        paragraphs.append(" ".join(rng.choice(VOCABULARY) for _ in range(size)))
+    return "\n\n".join(paragraphs)
+
+
+class Command(BaseCommand):
+    help = "Benchmarks entry word counting against the original regex implementation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        self.stdout.write(
+            f"{'words':>8} {'regex findall':>14} {'cold':>10} {'autosave':>10}"
+        )
+        for size in (1000, 10000, 100000):
+            words = generate_entry(size)
+            # An autosave typically appends to the last paragraph
+            edited = words + " more"
+
+            assert count_words(words) == len(re.findall(r"\w+", words))
+
+            baseline = timeit.timeit(
+                lambda: len(re.findall(r"\w+", edited)), number=repeat
+            )
+
+            def cold():
+                _count_paragraph_words.cache_clear()
+                count_words(edited)
+
+            cold_time = timeit.timeit(cold, number=repeat)
+
+            def autosave():
+                _count_paragraph_words.cache_clear()
+                count_words(words)  # previous autosave warmed the cache
+                start = timeit.default_timer()
+                count_words(edited)
+                return timeit.default_timer() - start
+
+            autosave_time = sum(autosave() for _ in range(repeat))
+
+            self.stdout.write(
+                f"{size:>8} "
+                f"{baseline / repeat * 1000:>12.3f}ms "
+                f"{cold_time / repeat * 1000:>8.3f}ms "
+                f"{autosave_time / repeat * 1000:>8.3f}ms"
+            )
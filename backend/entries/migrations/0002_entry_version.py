@@ -0,0 +1,18 @@
+# Generated by Django 3.0.1 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("entries", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="entry",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.0.1 on 2026-10-18 15:18
+
+import hashlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def populate_words_digest(apps, schema_editor):
+    Entry = apps.get_model("entries", "Entry")
+    entries = Entry.objects.filter(words_digest="").only("pk", "words")
+    batch = []
+    for entry in entries.iterator(chunk_size=BATCH_SIZE):
+        entry.words_digest = hashlib.sha256(
+            (entry.words or "").encode("utf-8")
+        ).hexdigest()
+        batch.append(entry)
+        if len(batch) == BATCH_SIZE:
+            Entry.objects.bulk_update(batch, ["words_digest"])
+            batch = []
+    Entry.objects.bulk_update(batch, ["words_digest"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("entries", "0002_entry_version")]
+
+    operations = [
+        migrations.AddField(
+            model_name="entry",
+            name="words_digest",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.RunPython(populate_words_digest, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.0.1 on 2026-10-18 15:22
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+EXCERPT_LENGTH = 200
+
+
+def populate_excerpt(apps, schema_editor):
+    Entry = apps.get_model("entries", "Entry")
+    entries = Entry.objects.exclude(words="").exclude(words=None).only("pk", "words")
+    batch = []
+    for entry in entries.iterator(chunk_size=BATCH_SIZE):
+        entry.excerpt = entry.words[:EXCERPT_LENGTH]
+        batch.append(entry)
+        if len(batch) == BATCH_SIZE:
+            Entry.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    Entry.objects.bulk_update(batch, ["excerpt"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("entries", "0003_entry_words_digest")]
+
+    operations = [
+        migrations.AddField(
+            model_name="entry",
+            name="excerpt",
+            field=models.CharField(blank=True, default="", max_length=200),
+        ),
+        migrations.RunPython(populate_excerpt, migrations.RunPython.noop),
+    ]
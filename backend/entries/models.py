@@ -1,20 +1,67 @@
 from api.models import BaseModel
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from entries.caches import invalidate_entry_list_cache
+from entries.edits import words_digest
 from timezone_field import TimeZoneField
 
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(words):
+    """ Returns the excerpt stored alongside an entry's words for previews
+    """
+    return (words or "")[:EXCERPT_LENGTH]
+
+
+class EntryQuerySet(models.QuerySet):
+    def with_words(self):
+        """ Includes the (potentially large) words in the query
+        """
+        return self.defer(None)
+
+
+class EntryManager(models.Manager.from_queryset(EntryQuerySet)):
+    """ Entry manager that defers loading the words by default
+
+    Entry words are large compared with the rest of the row (and stored out-of-line by
+    PostgreSQL), so only queries that render them should load them. See `with_words`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer("words")
+
 
 class Entry(BaseModel):
     author = models.ForeignKey(get_user_model(), on_delete=models.PROTECT)
     entry_date = models.DateField()
     entry_timezone = TimeZoneField()
     words = models.TextField(blank=True, null=True)
+    words_digest = models.CharField(max_length=64, blank=True, default="")
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default="")
     word_count = models.IntegerField()
     start_time = models.DateTimeField(null=True, blank=True)
     finish_time = models.DateTimeField(null=True, blank=True)
     milestone_word_count = models.PositiveIntegerField()
     milestone_time = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = EntryManager()
 
     class Meta:
         unique_together = ("author", "entry_date")
         verbose_name_plural = "entries"
+
+    def save(self, *args, **kwargs):
+        if "words" not in self.get_deferred_fields():
+            self.words_digest = words_digest(self.words)
+            self.excerpt = make_excerpt(self.words)
+        super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=Entry)
+@receiver(post_delete, sender=Entry)
+def invalidate_author_entry_list(sender, instance, **kwargs):
+    invalidate_entry_list_cache(instance.author_id)
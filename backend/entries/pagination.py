@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class EntryCursorPagination(CursorPagination):
+    """
+    Keyset pagination for an author's entries, newest first
+
+    Pages are fetched by seeking on the (author, entry_date) unique index, so each page
+    costs the same however far back it is and no count query is needed.
+    """
+
+    ordering = "-entry_date"
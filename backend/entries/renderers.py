@@ -0,0 +1,15 @@
+from entries.events import format_event
+from rest_framework.renderers import BaseRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    """ Renders responses other than the event stream itself (e.g. errors) as a single
+    `error` server-sent event
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event("error", data)
@@ -24,7 +24,7 @@ class EntriesRouter(SimpleRouter):
         Route(
             detail=True,
             url=r"^{prefix}/(?P<username>[\w.@+-]+)/{lookup}/$",
-            mapping={"get": "retrieve", "patch": "partial_update", "put": "update"},
+            mapping={"get": "retrieve", "patch": "partial_update", "put": "upsert"},
             name="{basename}-detail",
             initkwargs={"suffix": "Detail"},
         ),
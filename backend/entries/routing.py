@@ -0,0 +1,10 @@
+from entries.consumers import EntryAutosaveConsumer, EntryEventsConsumer
+
+http_routes = [(r"^/api/entries/(?P<username>[^/]+)/events/$", EntryEventsConsumer)]
+
+websocket_routes = [
+    (
+        r"^/api/entries/(?P<username>[\w.@+-]+)/(?P<entry_date>\d{4}-\d{2}-\d{2})/autosave/$",
+        EntryAutosaveConsumer,
+    )
+]
@@ -1,16 +1,36 @@
-import re
 from datetime import datetime
 
-from api.exceptions import UnprocessibleError
+from api.exceptions import (
+    ConflictError,
+    PreconditionFailedError,
+    UnprocessibleError,
+)
 from api.validators import UniqueTogetherProcessableValidator
 from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from entries.models import Entry
+from entries.caches import invalidate_entry_list_cache
+from entries.edits import apply_edits, words_digest
+from entries.events import publish_entry_events
+from entries.models import Entry, make_excerpt
+from entries.word_count import count_words
 from rest_framework import serializers
+from users.models import DailyWritingProfile
 from users.serializers import TimezoneField
 
 
+class EntryEditSerializer(serializers.Serializer):
+    """ Serializer for a single text edit operation applied to an entry's words
+
+    `position` and `delete` count UTF-16 code units (see entries.edits.apply_edits).
+    """
+
+    position = serializers.IntegerField(min_value=0)
+    delete = serializers.IntegerField(min_value=0, default=0)
+    insert = serializers.CharField(allow_blank=True, default="", trim_whitespace=False)
+
+
 class EntrySerializer(serializers.ModelSerializer):
     """ Serializer for the Entry model
 
@@ -18,12 +38,31 @@ class EntrySerializer(serializers.ModelSerializer):
     - users may only author only one entry per day, according to the user profile timezone at time creation time
     - start time and milestone word count is taken from the user's profile upon creation
     - milestone time is set only once when the milestone word count is first achieved
+
+    Updates may send either the full `words` or a list of `edits` along with the
+    `base_digest` of the words the edits were made against (see entries.edits).
+
+    Every update increments the entry `version`. When the serializer context has an
+    `if_match` list of versions, the update only applies if the stored version is one
+    of them. The check and increment happen in a single conditional UPDATE.
+
+    Updates whose words match the stored `words_digest` are no-ops: nothing is
+    recalculated or written. Other updates write only the columns that changed.
+
+    Creates and updates publish an `entry_updated` event, and `milestone_reached` when
+    the milestone word count is first exceeded, to the author's subscribers (see
+    entries.events).
+
+    A `fields` list in the serializer context limits the representation to those
+    fields (e.g. `Meta.minimal_fields`), without affecting which fields are writable.
     """
 
     author = serializers.SlugRelatedField(
         slug_field="username", queryset=get_user_model().objects.all()
     )
     entry_timezone = TimezoneField(required=False, read_only=True)
+    edits = EntryEditSerializer(many=True, required=False, write_only=True)
+    base_digest = serializers.CharField(required=False, write_only=True)
 
     class Meta:
         model = Entry
@@ -36,9 +75,14 @@ class EntrySerializer(serializers.ModelSerializer):
             "finish_time",
             "milestone_word_count",
             "words",
+            "words_digest",
+            "excerpt",
             "word_count",
             "created_date",
             "modified_date",
+            "version",
+            "edits",
+            "base_digest",
         )
         extra_kwargs = {
             "finish_time": {"read_only": True},
@@ -47,18 +91,55 @@ class EntrySerializer(serializers.ModelSerializer):
             "modified_date": {"read_only": True},
             "milestone_word_count": {"read_only": True},
             "word_count": {"read_only": True},
+            "version": {"read_only": True},
+            "words_digest": {"read_only": True},
+            "excerpt": {"read_only": True},
         }
+        minimal_fields = (
+            "word_count",
+            "words_digest",
+            "finish_time",
+            "milestone_time",
+            "modified_date",
+            "version",
+        )
         validators = [
             UniqueTogetherProcessableValidator(
                 queryset=Entry.objects.all(), fields=("author", "entry_date")
             )
         ]
 
+    @property
+    def _readable_fields(self):
+        fields = self.context.get("fields")
+        for field in super()._readable_fields:
+            if fields is None or field.field_name in fields:
+                yield field
+
+    def validate(self, data):
+        """ Validate related fields
+        """
+        if "edits" in data:
+            if "words" in data:
+                raise UnprocessibleError(
+                    {"edits": _("Edits may not be combined with words")}
+                )
+            if "base_digest" not in data:
+                raise UnprocessibleError(
+                    {"base_digest": _("Base digest is required with edits")}
+                )
+        return data
+
     def create(self, validated_data):
         """ Prepare a new Entry based on validated data
         """
+        if "edits" in validated_data:
+            raise UnprocessibleError(
+                {"edits": _("Edits may only be applied to an existing entry")}
+            )
+        validated_data.pop("base_digest", None)
         author = validated_data["author"]
-        author_profile = author.daily_writing_profile
+        author_profile = DailyWritingProfile.objects.get_for_user(author)
 
         validated_data["entry_timezone"] = author_profile.timezone
         validated_data[
@@ -69,7 +150,45 @@ class EntrySerializer(serializers.ModelSerializer):
             validated_data, author_profile.target_milestone_word_count
         )
 
-        return super(EntrySerializer, self).create(validated_data)
+        entry = super(EntrySerializer, self).create(validated_data)
+        publish_entry_events(entry, milestone_reached=entry.milestone_time is not None)
+        return entry
+
+    def upsert(self, author, entry_date):
+        """ Returns the author's entry for today, first creating it if it doesn't exist
+
+        An existing entry is returned without writing. Otherwise the entry is created
+        from the author's profile defaults with a single `INSERT ... ON CONFLICT DO
+        NOTHING`, so concurrent upserts neither fail nor create duplicates.
+        """
+        self._verify_entry_for_today(entry_date)
+        entries = (
+            Entry.objects.with_words()
+            .select_related("author")
+            .filter(author=author, entry_date=entry_date)
+        )
+        self.instance = entries.first()
+        if self.instance is not None:
+            return self.instance
+
+        author_profile = DailyWritingProfile.objects.get_for_user(author)
+        Entry.objects.bulk_create(
+            [
+                Entry(
+                    author=author,
+                    entry_date=entry_date,
+                    entry_timezone=author_profile.timezone,
+                    words="",
+                    words_digest=words_digest(""),
+                    word_count=0,
+                    milestone_word_count=author_profile.target_milestone_word_count,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        invalidate_entry_list_cache(author.pk)
+        self.instance = entries.get()
+        return self.instance
 
     def update(self, instance, validated_data):
         """ Prepare an update Entry based on validated data
@@ -84,9 +203,86 @@ class EntrySerializer(serializers.ModelSerializer):
             )
 
         self._verify_entry_for_today(validated_data["entry_date"], instance)
+        if_match = self.context.get("if_match")
+        if if_match is not None and instance.version not in if_match:
+            raise PreconditionFailedError(_("Entry has been modified"))
+        edits = validated_data.pop("edits", None)
+        base_digest = validated_data.pop("base_digest", None)
+        if edits is not None:
+            validated_data["words"] = self._apply_edits(instance, edits, base_digest)
+
+        validated_data.setdefault("words", instance.words)
+        validated_data["words_digest"] = words_digest(validated_data["words"])
+        if validated_data["words_digest"] == instance.words_digest:
+            # Nothing changed: skip recalculation and the write altogether
+            return instance
+        validated_data["excerpt"] = make_excerpt(validated_data["words"])
+
         self._calculate_fields(validated_data, instance.milestone_word_count)
+        milestone_reached = (
+            instance.milestone_time is None and "milestone_time" in validated_data
+        )
+        changes = {
+            attr: value
+            for attr, value in validated_data.items()
+            if getattr(instance, attr) != value
+        }
+        changes["modified_date"] = validated_data["finish_time"]
 
-        return super(EntrySerializer, self).update(instance, validated_data)
+        entry_buffer = self.context.get("entry_buffer")
+        if entry_buffer is not None:
+            # Write-behind: acknowledge now and leave the DB write to the buffer
+            for attr, value in changes.items():
+                setattr(instance, attr, value)
+            instance.version += 1
+            entry_buffer.put(instance)
+            invalidate_entry_list_cache(instance.author_id)
+        else:
+            self._update_if_version(
+                instance,
+                changes,
+                if_match_required=if_match is not None,
+                base_digest=base_digest if edits is not None else None,
+            )
+        publish_entry_events(instance, milestone_reached)
+        return instance
+
+    def _update_if_version(self, instance, changes, if_match_required, base_digest):
+        """ Writes the changed columns and increments the version with one conditional UPDATE
+
+        The update applies only while the stored version is the version that was read.
+        Otherwise, edits apply only while the stored words are still the words they were
+        made against (`base_digest`), raising ConflictError if not. Full words without
+        an If-Match precondition fall back to last write wins. The new version is read
+        back after a fallback.
+        """
+        entries = Entry.objects.filter(pk=instance.pk)
+        if entries.filter(version=instance.version).update(
+            version=F("version") + 1, **changes
+        ):
+            version = instance.version + 1
+        elif if_match_required:
+            raise PreconditionFailedError(_("Entry has been modified"))
+        elif base_digest is not None:
+            if not entries.filter(words_digest=base_digest).update(
+                version=F("version") + 1, **changes
+            ):
+                raise ConflictError(
+                    {"base_digest": _("Edits were made against an outdated revision")}
+                )
+            version = None
+        else:
+            entries.update(version=F("version") + 1, **changes)
+            version = None
+
+        for attr, value in changes.items():
+            setattr(instance, attr, value)
+        if version is None:
+            instance.refresh_from_db(fields=["version"])
+        else:
+            instance.version = version
+        invalidate_entry_list_cache(instance.author_id)
+        return instance
 
     def _verify_entry_for_today(self, entry_date, instance=None):
         if instance and instance.entry_date != entry_date:
@@ -100,10 +296,39 @@ class EntrySerializer(serializers.ModelSerializer):
                 {"entry_date": _("Entry date must be today's date (UTC)")}
             )
 
+    def _apply_edits(self, instance, edits, base_digest):
+        if base_digest != instance.words_digest:
+            raise ConflictError(
+                {"base_digest": _("Edits were made against an outdated revision")}
+            )
+        try:
+            return apply_edits(instance.words, edits)
+        except ValueError:
+            raise UnprocessibleError({"edits": _("Edit is out of range")})
+
     def _calculate_fields(self, validated_data, milestone_word_count):
-        word_count = len(re.findall(r"\w+", validated_data["words"]))
+        word_count = count_words(validated_data["words"])
         validated_data["word_count"] = word_count
         validated_data["finish_time"] = timezone.now()
 
         if word_count > milestone_word_count:
             validated_data["milestone_time"] = validated_data["finish_time"]
+
+
+class EntryAutosaveSerializer(EntrySerializer):
+    """ EntrySerializer for updates over an entry's autosave channel (see
+    entries.consumers)
+
+    The channel is bound to one entry, so its author, date and start time are taken
+    from the instance rather than sent and validated with every save.
+    """
+
+    class Meta(EntrySerializer.Meta):
+        validators = []
+
+    def validate(self, data):
+        data = super().validate(data)
+        data.pop("author", None)
+        data["entry_date"] = self.instance.entry_date
+        data["start_time"] = self.instance.start_time
+        return data
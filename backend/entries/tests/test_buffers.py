@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.utils import timezone as django_timezone
+from entries.buffers import EntryWriteBehindBuffer, get_entry_buffer
+from entries.models import Entry
+
+UserModel = get_user_model()
+
+
+class TestEntryWriteBehindBuffer(TestCase):
+    """ Unit tests for the entry write-behind buffer
+    """
+
+    def setUp(self):
+        self.buffer = EntryWriteBehindBuffer()
+        self.addCleanup(self.buffer.cache.clear)
+        patcher = mock.patch.object(EntryWriteBehindBuffer, "_ensure_flusher")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.entry = Entry.objects.create(
+            author=self.test_user,
+            entry_date=datetime.now(timezone.utc).date(),
+            entry_timezone="UTC",
+            words="one",
+            word_count=1,
+            milestone_word_count=3,
+        )
+
+    def buffer_words(self, words, word_count):
+        self.entry.words = words
+        self.entry.word_count = word_count
+        self.entry.finish_time = self.entry.modified_date = django_timezone.now()
+        self.buffer.put(self.entry)
+
+    def test_put_does_not_write(self):
+        """ Buffered entries are not written to the database
+        """
+        self.buffer_words("one two", 2)
+        self.assertEqual(Entry.objects.get().words, "one")
+
+    def test_read_through(self):
+        """ Entries read from the database are overlaid with buffered values
+        """
+        self.buffer_words("one two", 2)
+        entry = self.buffer.read_through(Entry.objects.get())
+        self.assertEqual(entry.words, "one two")
+        self.assertEqual(entry.word_count, 2)
+
+        entries = self.buffer.read_through_many(Entry.objects.all())
+        self.assertEqual(entries[0].words, "one two")
+
+    def test_flush_coalesces(self):
+        """ Flushing writes only the latest buffered state once per entry
+        """
+        self.buffer_words("one two", 2)
+        self.buffer_words("one two three", 3)
+
+        with self.assertNumQueries(1):
+            self.buffer.flush()
+        entry = Entry.objects.get()
+        self.assertEqual(entry.words, "one two three")
+        self.assertEqual(entry.word_count, 3)
+
+        with self.assertNumQueries(0):
+            self.buffer.flush()
+
+    def test_flush_entry(self):
+        self.buffer_words("one two", 2)
+        self.buffer.flush_entry(self.entry.pk)
+        self.assertEqual(Entry.objects.get().words, "one two")
+
+    def test_flush_from_other_process(self):
+        """ Saves buffered by a process which exited without flushing are flushed by
+        the others
+        """
+        self.buffer_words("one two", 2)
+        other_buffer = EntryWriteBehindBuffer()
+
+        self.assertEqual(other_buffer.pending(), {self.entry.pk})
+        other_buffer.flush()
+
+        self.assertEqual(Entry.objects.get().words, "one two")
+        self.assertEqual(other_buffer.pending(), set())
+
+    def test_flush_entry_buffered_during_flush(self):
+        """ Entries buffered again while they are flushed stay pending
+        """
+        self.buffer_words("one two", 2)
+        update = Entry.objects.filter(pk=self.entry.pk).update
+
+        def buffer_during_update(**values):
+            self.buffer_words("one two three", 3)
+            return update(**values)
+
+        with mock.patch.object(
+            Entry.objects, "filter", return_value=mock.Mock(update=buffer_during_update)
+        ):
+            self.buffer.flush_entry(self.entry.pk)
+
+        self.assertEqual(self.buffer.pending(), {self.entry.pk})
+        self.buffer.flush()
+        self.assertEqual(Entry.objects.get().words, "one two three")
+        self.assertEqual(self.buffer.pending(), set())
+
+    def test_flush_entry_evicted(self):
+        """ Saves evicted from the cache before they are flushed are still written
+        """
+        self.buffer_words("one two", 2)
+        self.buffer.cache.clear()
+
+        with self.assertLogs("entries.buffers", "ERROR"):
+            self.buffer.flush()
+
+        self.assertEqual(Entry.objects.get().words, "one two")
+        self.assertEqual(self.buffer._dirty, {})
+
+    def test_flush_error_retried(self):
+        """ Entries which fail to flush stay buffered for the next flush
+        """
+        self.buffer_words("one two", 2)
+
+        with mock.patch.object(Entry.objects, "filter", side_effect=Exception):
+            with self.assertLogs("entries.buffers", "ERROR"):
+                self.buffer.flush()
+        self.buffer.flush()
+
+        self.assertEqual(Entry.objects.get().words, "one two")
+
+    @override_settings(WEB_CONCURRENCY=2)
+    def test_process_local_cache(self):
+        """ A local-memory cache is refused when several worker processes serve requests
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            EntryWriteBehindBuffer()
+
+    def test_get_entry_buffer(self):
+        with override_settings(ENTRIES_WRITE_BEHIND=False):
+            self.assertIsNone(get_entry_buffer())
+        with override_settings(ENTRIES_WRITE_BEHIND=True):
+            self.assertIsInstance(get_entry_buffer(), EntryWriteBehindBuffer)
+            self.assertIs(get_entry_buffer(), get_entry_buffer())
@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from entries.caches import EntryListCache, get_entry_list_cache
+from entries.models import Entry
+
+UserModel = get_user_model()
+
+
+class TestEntryListCache(TestCase):
+    """ Unit tests for the entry list page cache
+    """
+
+    def setUp(self):
+        self.list_cache = EntryListCache()
+        self.addCleanup(self.list_cache.cache.clear)
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+
+    def test_get_set(self):
+        """ Cached pages are returned for the same generation and path only
+        """
+        generation = self.list_cache.generation(self.test_user.pk)
+        response = HttpResponse(b"[]", content_type="application/json")
+        self.list_cache.set(self.test_user.pk, generation, "/entries/tester/", response)
+
+        self.assertEqual(
+            self.list_cache.get(self.test_user.pk, generation, "/entries/tester/"),
+            (b"[]", "application/json"),
+        )
+        self.assertIsNone(
+            self.list_cache.get(self.test_user.pk, generation, "/entries/tester/?a")
+        )
+
+    def test_bump_generation(self):
+        """ Bumping the generation moves on from previously cached pages
+        """
+        generation = self.list_cache.generation(self.test_user.pk)
+        self.list_cache.bump_generation(self.test_user.pk)
+
+        self.assertGreater(self.list_cache.generation(self.test_user.pk), generation)
+
+    def test_bump_generation_evicted(self):
+        """ Bumping an evicted generation never reuses an earlier generation
+        """
+        generation = self.list_cache.generation(self.test_user.pk)
+        self.list_cache.cache.clear()
+        self.list_cache.bump_generation(self.test_user.pk)
+
+        self.assertGreater(self.list_cache.generation(self.test_user.pk), generation)
+
+    @override_settings(ENTRIES_LIST_CACHE=True)
+    def test_entry_save_invalidates(self):
+        """ Saving an entry bumps its author's generation
+        """
+        list_cache = get_entry_list_cache()
+        generation = list_cache.generation(self.test_user.pk)
+        Entry.objects.create(
+            author=self.test_user,
+            entry_date="2019-01-01",
+            entry_timezone="UTC",
+            words="one",
+            word_count=1,
+            milestone_word_count=3,
+        )
+
+        self.assertGreater(list_cache.generation(self.test_user.pk), generation)
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from api.asgi import database_sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from dailywriting.asgi import application
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.test import TransactionTestCase
+from entries.authentication import issue_events_token
+from entries.edits import words_digest
+from entries.events import format_event, get_event_broker
+from entries.models import Entry
+from rest_framework_jwt.settings import api_settings
+
+UserModel = get_user_model()
+
+
+class TestEntryAutosaveConsumer(TransactionTestCase):
+    """ Consumers run the database access in other threads, so this uses a
+    TransactionTestCase for the test data to be visible to them.
+    """
+
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.other_user = UserModel.objects.create(
+            username="tester2", email="tester2@email.com"
+        )
+        self.today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        self.entry = Entry.objects.create(
+            author=self.test_user,
+            entry_date=self.today,
+            start_time=datetime.now(timezone.utc),
+            words="My first entry",
+            words_digest=words_digest("My first entry"),
+            word_count=3,
+            milestone_word_count=4,
+        )
+
+    def get_token(self, user):
+        return api_settings.JWT_ENCODE_HANDLER(api_settings.JWT_PAYLOAD_HANDLER(user))
+
+    def converse(self, messages, user=None, username=None, on_ready=None):
+        """ Connects to the entry's autosave channel, sends each message and returns
+        each output
+
+        `on_ready` is called (in a thread) once the channel has authenticated.
+        """
+        return asyncio.get_event_loop().run_until_complete(
+            self.converse_async(messages, user or self.test_user, username, on_ready)
+        )
+
+    async def converse_async(self, messages, user, username, on_ready):
+        communicator = ApplicationCommunicator(
+            application,
+            {
+                "type": "websocket",
+                "path": f"/api/entries/{username or user.username}/{self.today}/autosave/",
+                "query_string": b"",
+                "headers": [(b"host", b"testserver")],
+            },
+        )
+        await communicator.send_input({"type": "websocket.connect"})
+        outputs = [await communicator.receive_output(timeout=5)]
+        messages = [{"type": "authenticate", "token": self.get_token(user)}] + messages
+        for message in messages:
+            await communicator.send_input(
+                {"type": "websocket.receive", "text": json.dumps(message)}
+            )
+            output = await communicator.receive_output(timeout=5)
+            outputs.append(json.loads(output["text"]) if "text" in output else output)
+            if output["type"] == "websocket.close":
+                break
+            if on_ready is not None and outputs[-1].get("type") == "ready":
+                await database_sync_to_async(on_ready)()
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout=5)
+        return outputs
+
+    def test_save_words(self):
+        accept, ready, ack = self.converse(
+            [{"type": "save", "id": 1, "words": "My first entry, updated"}]
+        )
+
+        self.assertEqual(accept, {"type": "websocket.accept"})
+        self.assertEqual(ready["type"], "ready")
+        self.assertEqual(ready["entry"]["version"], 1)
+        self.assertEqual(ack["type"], "ack")
+        self.assertEqual(ack["id"], 1)
+        self.assertEqual(ack["entry"]["wordCount"], 4)
+        self.assertIsNone(ack["entry"]["milestoneTime"])
+        self.assertEqual(ack["entry"]["version"], 2)
+        self.assertNotIn("words", ack["entry"])
+        entry = Entry.objects.get()
+        self.assertEqual(entry.words, "My first entry, updated")
+        self.assertEqual(entry.version, 2)
+
+    def test_save_edits(self):
+        accept, ready, first_ack, second_ack = self.converse(
+            [
+                {
+                    "type": "save",
+                    "id": 1,
+                    "edits": [{"position": 14, "insert": " today"}],
+                    "baseDigest": words_digest("My first entry"),
+                },
+                {
+                    "type": "save",
+                    "id": 2,
+                    "edits": [{"position": 20, "insert": " again"}],
+                    "baseDigest": words_digest("My first entry today"),
+                },
+            ]
+        )
+
+        self.assertEqual(first_ack["entry"]["wordCount"], 4)
+        self.assertEqual(second_ack["id"], 2)
+        self.assertEqual(second_ack["entry"]["wordCount"], 5)
+        self.assertIsNotNone(second_ack["entry"]["milestoneTime"])
+        self.assertEqual(Entry.objects.get().words, "My first entry today again")
+
+    def test_save_error(self):
+        """ Saves the REST API would reject are answered with the same errors and the
+        channel stays open
+        """
+        accept, ready, error, ack = self.converse(
+            [
+                {"type": "save", "id": 1, "edits": [{"position": 0, "insert": "!"}]},
+                {"type": "save", "id": 2, "words": "Still writing"},
+            ]
+        )
+
+        self.assertEqual(
+            error,
+            {
+                "type": "error",
+                "id": 1,
+                "status": 422,
+                "errors": {"baseDigest": "Base digest is required with edits"},
+            },
+        )
+        self.assertEqual(ack["type"], "ack")
+        self.assertEqual(Entry.objects.get().words, "Still writing")
+
+    def modify_entry(self):
+        """ Modifies the entry as a save through the REST API would
+        """
+        Entry.objects.filter(pk=self.entry.pk).update(
+            words="My first entry, from elsewhere",
+            words_digest=words_digest("My first entry, from elsewhere"),
+            version=F("version") + 1,
+        )
+
+    def test_save_words_conflict(self):
+        """ Full words saved over an entry modified since the channel last saved it are
+        answered with a conflict carrying the entry, and aren't written
+        """
+        accept, ready, conflict, ack = self.converse(
+            [
+                {"type": "save", "id": 1, "words": "My first entry, updated"},
+                {"type": "save", "id": 2, "words": "My first entry, merged"},
+            ],
+            on_ready=self.modify_entry,
+        )
+
+        self.assertEqual(conflict["type"], "error")
+        self.assertEqual(conflict["id"], 1)
+        self.assertEqual(conflict["status"], 409)
+        self.assertEqual(conflict["entry"]["version"], 2)
+        self.assertEqual(ack["entry"]["version"], 3)
+        self.assertEqual(Entry.objects.get().words, "My first entry, merged")
+
+    def test_save_edits_conflict(self):
+        """ Edits made against words modified since the channel loaded the entry are
+        answered with a conflict, and aren't written
+        """
+        accept, ready, conflict = self.converse(
+            [
+                {
+                    "type": "save",
+                    "id": 1,
+                    "edits": [{"position": 14, "insert": " today"}],
+                    "baseDigest": words_digest("My first entry"),
+                }
+            ],
+            on_ready=self.modify_entry,
+        )
+
+        self.assertEqual(conflict["status"], 409)
+        self.assertEqual(conflict["entry"]["version"], 2)
+        self.assertEqual(Entry.objects.get().words, "My first entry, from elsewhere")
+
+    def test_authentication_failed(self):
+        self.get_token = lambda user: "invalid"
+
+        accept, close = self.converse([{"type": "save", "words": "Not saved"}])
+
+        self.assertEqual(close, {"type": "websocket.close", "code": 4001})
+        self.assertEqual(Entry.objects.get().words, "My first entry")
+
+    def test_permission_denied(self):
+        accept, close = self.converse([], user=self.other_user, username="tester")
+
+        self.assertEqual(close, {"type": "websocket.close", "code": 4003})
+
+    def test_entry_not_found(self):
+        accept, close = self.converse([], user=self.other_user)
+
+        self.assertEqual(close, {"type": "websocket.close", "code": 4004})
+
+    def connect_idle(self, entry_date):
+        """ Connects to the autosave channel for `entry_date` without authenticating
+        and returns the outputs until the channel is closed
+        """
+
+        async def connect():
+            communicator = ApplicationCommunicator(
+                application,
+                {
+                    "type": "websocket",
+                    "path": f"/api/entries/tester/{entry_date}/autosave/",
+                    "query_string": b"",
+                    "headers": [(b"host", b"testserver")],
+                },
+            )
+            await communicator.send_input({"type": "websocket.connect"})
+            outputs = [await communicator.receive_output(timeout=5)]
+            while outputs[-1]["type"] != "websocket.close":
+                outputs.append(await communicator.receive_output(timeout=5))
+            await communicator.send_input(
+                {"type": "websocket.disconnect", "code": outputs[-1]["code"]}
+            )
+            await communicator.wait(timeout=5)
+            return outputs
+
+        return asyncio.get_event_loop().run_until_complete(connect())
+
+    def test_invalid_date(self):
+        accept, close = self.connect_idle("2020-02-30")
+
+        self.assertEqual(accept, {"type": "websocket.accept"})
+        self.assertEqual(close, {"type": "websocket.close", "code": 4004})
+
+    @mock.patch("entries.consumers.EntryAutosaveConsumer.AUTHENTICATION_TIMEOUT", 0.01)
+    def test_authentication_timeout(self):
+        accept, close = self.connect_idle(self.today)
+
+        self.assertEqual(accept, {"type": "websocket.accept"})
+        self.assertEqual(close, {"type": "websocket.close", "code": 4001})
+
+    @mock.patch("entries.consumers.EntryAutosaveConsumer.AUTHENTICATION_TIMEOUT", 0.01)
+    def test_authenticated_past_timeout(self):
+        accept, ready, ack = self.converse(
+            [{"type": "save", "id": 1, "words": "My first entry, saved later"}],
+            on_ready=lambda: time.sleep(0.1),
+        )
+
+        self.assertEqual(ready["type"], "ready")
+        self.assertEqual(ack["type"], "ack")
+
+
+class TestEntryEventsConsumer(TransactionTestCase):
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.token = api_settings.JWT_ENCODE_HANDLER(
+            api_settings.JWT_PAYLOAD_HANDLER(self.test_user)
+        )
+
+    def get_communicator(self, query_string):
+        return ApplicationCommunicator(
+            application,
+            {
+                "type": "http",
+                "http_version": "1.1",
+                "method": "GET",
+                "path": "/api/entries/tester/events/",
+                "query_string": query_string,
+                "headers": [(b"host", b"testserver")],
+            },
+        )
+
+    def test_stream(self):
+        async def stream():
+            communicator = self.get_communicator(
+                f"token={issue_events_token(self.test_user)}".encode()
+            )
+            await communicator.send_input({"type": "http.request", "body": b""})
+            start = await communicator.receive_output(timeout=5)
+            get_event_broker().publish(
+                self.test_user.pk, "entry_updated", {"version": 2}
+            )
+            body = await communicator.receive_output(timeout=5)
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait(timeout=5)
+            return start, body
+
+        start, body = asyncio.get_event_loop().run_until_complete(stream())
+
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        self.assertEqual(body["body"], format_event("entry_updated", {"version": 2}))
+        self.assertNotIn(self.test_user.pk, get_event_broker()._subscribers)
+
+    def get_response_start(self, query_string):
+        async def stream():
+            communicator = self.get_communicator(query_string)
+            await communicator.send_input({"type": "http.request", "body": b""})
+            return await communicator.receive_output(timeout=5)
+
+        return asyncio.get_event_loop().run_until_complete(stream())
+
+    def test_unauthenticated(self):
+        start = self.get_response_start(b"token=invalid")
+
+        self.assertEqual(start["status"], 401)
+
+    def test_jwt_query_parameter(self):
+        start = self.get_response_start(f"token={self.token}".encode())
+
+        self.assertEqual(start["status"], 401)
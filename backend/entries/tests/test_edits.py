@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+from entries.edits import apply_edits, words_digest
+
+
+class TestApplyEdits(TestCase):
+    """Unit tests for applying text edit operations"""
+
+    def test_apply_edits_insert(self):
+        self.assertEqual(
+            apply_edits("one three", [{"position": 4, "insert": "two "}]),
+            "one two three",
+        )
+
+    def test_apply_edits_delete(self):
+        self.assertEqual(
+            apply_edits("one two three", [{"position": 3, "delete": 4}]), "one three"
+        )
+
+    def test_apply_edits_replace(self):
+        self.assertEqual(
+            apply_edits("one two three", [{"position": 4, "delete": 3, "insert": "2"}]),
+            "one 2 three",
+        )
+
+    def test_apply_edits_sequential(self):
+        """Edits are applied against the result of the previous edit"""
+        self.assertEqual(
+            apply_edits(
+                "abc", [{"position": 3, "insert": "d"}, {"position": 0, "delete": 1}],
+            ),
+            "bcd",
+        )
+
+    def test_apply_edits_to_empty_words(self):
+        self.assertEqual(apply_edits(None, [{"position": 0, "insert": "a"}]), "a")
+
+    def test_apply_edits_out_of_range(self):
+        with self.assertRaises(ValueError):
+            apply_edits("abc", [{"position": 2, "delete": 2}])
+        with self.assertRaises(ValueError):
+            apply_edits("abc", [{"position": 4, "insert": "d"}])
+
+    def test_apply_edits_utf16_positions(self):
+        """Positions count UTF-16 code units, so an emoji before an edit counts as two"""
+        self.assertEqual(
+            apply_edits("\U0001f600 one three", [{"position": 7, "insert": "two "}]),
+            "\U0001f600 one two three",
+        )
+        self.assertEqual(
+            apply_edits("a\U0001f600b", [{"position": 1, "delete": 2}]), "ab"
+        )
+
+    def test_apply_edits_split_character(self):
+        with self.assertRaises(ValueError):
+            apply_edits("a\U0001f600b", [{"position": 2, "insert": "c"}])
+
+
+class TestWordsDigest(TestCase):
+    """Unit tests for the words digest"""
+
+    def test_words_digest_empty(self):
+        self.assertEqual(words_digest(None), words_digest(""))
+
+    def test_words_digest_differs(self):
+        self.assertNotEqual(words_digest("one"), words_digest("one "))
@@ -0,0 +1,212 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from entries import events
+from entries.authentication import issue_events_token
+from entries.events import (
+    HEARTBEAT,
+    EventBroker,
+    format_event,
+    get_event_broker,
+    stream_events,
+)
+from entries.models import Entry
+from entries.serializers import EntrySerializer
+from rest_framework_jwt.settings import api_settings
+
+UserModel = get_user_model()
+
+
+class TestEventBroker(SimpleTestCase):
+    def test_publish(self):
+        broker = EventBroker()
+        deliver, other_deliver = mock.Mock(), mock.Mock()
+        broker.subscribe(1, deliver)
+        broker.subscribe(2, other_deliver)
+
+        broker.publish(1, "entry_updated", {"version": 2})
+
+        deliver.assert_called_once_with("entry_updated", {"version": 2})
+        other_deliver.assert_not_called()
+
+    def test_unsubscribe(self):
+        broker = EventBroker()
+        deliver = mock.Mock()
+        broker.subscribe(1, deliver)
+        broker.unsubscribe(1, deliver)
+
+        broker.publish(1, "entry_updated", {"version": 2})
+
+        deliver.assert_not_called()
+
+    def test_format_event(self):
+        self.assertEqual(
+            format_event("milestone_reached", {"word_count": 751}),
+            b'event: milestone_reached\ndata: {"wordCount": 751}\n\n',
+        )
+
+
+@mock.patch("entries.events.transaction.on_commit", lambda func: func())
+class TestEntryEvents(TestCase):
+    """ Events published by EntrySerializer saves
+    """
+
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.today = datetime.now(timezone.utc).date()
+        self.entry = Entry.objects.create(
+            author=self.test_user,
+            entry_date=self.today,
+            start_time=datetime.now(timezone.utc),
+            words="one",
+            word_count=1,
+            milestone_word_count=2,
+        )
+        self.deliver = mock.Mock()
+        get_event_broker().subscribe(self.test_user.pk, self.deliver)
+        self.addCleanup(get_event_broker().unsubscribe, self.test_user.pk, self.deliver)
+
+    def update(self, words):
+        serializer = EntrySerializer(
+            self.entry,
+            data={
+                "author": self.test_user.username,
+                "entry_date": self.today,
+                "start_time": self.entry.start_time.isoformat(),
+                "words": words,
+            },
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        self.entry = serializer.save()
+
+    def test_entry_updated(self):
+        self.update("one two")
+
+        self.deliver.assert_called_once_with(
+            "entry_updated",
+            {"entry_date": self.today.isoformat(), "version": 2, "word_count": 2},
+        )
+
+    def test_milestone_reached(self):
+        self.update("one two three")
+        self.update("one two three four")
+
+        events = [call[0][0] for call in self.deliver.call_args_list]
+        self.assertEqual(
+            events, ["entry_updated", "milestone_reached", "entry_updated"]
+        )
+        milestone_data = self.deliver.call_args_list[1][0][1]
+        self.assertEqual(milestone_data["word_count"], 3)
+        self.assertIn("milestone_time", milestone_data)
+
+    def test_unchanged(self):
+        self.update("one")
+
+        self.deliver.assert_not_called()
+
+
+class TestEntryEventsView(TestCase):
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.token = api_settings.JWT_ENCODE_HANDLER(
+            api_settings.JWT_PAYLOAD_HANDLER(self.test_user)
+        )
+
+    @mock.patch.object(events, "HEARTBEAT_INTERVAL", 0.01)
+    def test_stream_events(self):
+        stream = stream_events(1)
+        self.assertEqual(next(stream), HEARTBEAT)
+
+        get_event_broker().publish(1, "entry_updated", {"version": 2})
+
+        self.assertEqual(next(stream), format_event("entry_updated", {"version": 2}))
+        stream.close()
+        self.assertNotIn(1, get_event_broker()._subscribers)
+
+    @mock.patch.object(events, "HEARTBEAT_INTERVAL", 0.01)
+    def test_stream(self):
+        response = self.client.get(
+            f"/api/entries/tester/events/?token={issue_events_token(self.test_user)}",
+            HTTP_ACCEPT="text/event-stream",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), HEARTBEAT)
+        get_event_broker().publish(self.test_user.pk, "entry_updated", {"version": 2})
+        self.assertEqual(next(stream), format_event("entry_updated", {"version": 2}))
+        response.close()
+
+    def test_other_author(self):
+        UserModel.objects.create(username="tester2", email="tester2@email.com")
+
+        response = self.client.get(
+            "/api/entries/tester2/events/", HTTP_AUTHORIZATION=f"JWT {self.token}"
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_unauthenticated(self):
+        response = self.client.get("/api/entries/tester/events/")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(response.content.startswith(b"event: error\n"))
+
+    def test_jwt_query_parameter(self):
+        response = self.client.get(f"/api/entries/tester/events/?token={self.token}")
+
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(ENTRIES_EVENTS_TOKEN_MAX_AGE=-1)
+    def test_expired_events_token(self):
+        response = self.client.get(
+            f"/api/entries/tester/events/?token={issue_events_token(self.test_user)}"
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+
+class TestEntryEventsTokenView(TestCase):
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        self.token = api_settings.JWT_ENCODE_HANDLER(
+            api_settings.JWT_PAYLOAD_HANDLER(self.test_user)
+        )
+
+    @mock.patch.object(events, "HEARTBEAT_INTERVAL", 0.01)
+    def test_issue(self):
+        response = self.client.post(
+            "/api/entries/tester/events/token/", HTTP_AUTHORIZATION=f"JWT {self.token}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["expiresIn"], 60)
+        events_response = self.client.get(
+            f"/api/entries/tester/events/?token={response.json()['token']}"
+        )
+        self.assertEqual(events_response.status_code, 200)
+        events_response.close()
+
+    def test_other_author(self):
+        UserModel.objects.create(username="tester2", email="tester2@email.com")
+
+        response = self.client.post(
+            "/api/entries/tester2/events/token/", HTTP_AUTHORIZATION=f"JWT {self.token}"
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_unauthenticated(self):
+        response = self.client.post("/api/entries/tester/events/token/")
+
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from entries.edits import words_digest
+from entries.models import Entry
+
+UserModel = get_user_model()
+
+
+class TestEntryManager(TestCase):
+    """ Unit tests for the Entry manager
+    """
+
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+        Entry.objects.create(
+            author=self.test_user,
+            entry_date=datetime.now(timezone.utc).date(),
+            entry_timezone="UTC",
+            words="one two",
+            word_count=2,
+            milestone_word_count=3,
+        )
+
+    def test_words_deferred_by_default(self):
+        """ Entries are loaded without their words unless requested
+        """
+        self.assertIn("words", Entry.objects.get().get_deferred_fields())
+        self.assertNotIn(
+            "words", Entry.objects.with_words().get().get_deferred_fields()
+        )
+
+    def test_save_without_words_keeps_words_digest(self):
+        """ Saving an entry loaded without its words neither loads nor clobbers them
+        """
+        entry = Entry.objects.get()
+        entry.word_count = 3
+        with self.assertNumQueries(1):
+            entry.save()
+
+        entry = Entry.objects.with_words().get()
+        self.assertEqual(entry.words, "one two")
+        self.assertEqual(entry.words_digest, words_digest("one two"))
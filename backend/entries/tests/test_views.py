@@ -1,7 +1,15 @@
 from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone as django_timezone
+from entries.buffers import EntryWriteBehindBuffer, get_entry_buffer
+from entries.caches import get_entry_list_cache
+from entries.edits import words_digest
 from entries.models import Entry
 from entries.views import EntryViewSet
 from rest_framework import status
@@ -55,7 +63,8 @@ class TestEntryViewSet(APITestCase):
         response.render()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["count"], 0)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
         self.assertEqual(len(response.data["results"]), 0)
         self.assertEqual(response.data["results"], [])
 
@@ -72,7 +81,7 @@ class TestEntryViewSet(APITestCase):
         response.render()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["count"], 1)
+        self.assertIsNone(response.data["next"])
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(
             set(response.data["results"][0].keys()),
@@ -86,9 +95,12 @@ class TestEntryViewSet(APITestCase):
                     "finish_time",
                     "milestone_word_count",
                     "words",
+                    "words_digest",
+                    "excerpt",
                     "word_count",
                     "created_date",
                     "modified_date",
+                    "version",
                 ]
             ),
         )
@@ -129,11 +141,12 @@ class TestEntryViewSet(APITestCase):
         force_authenticate(request, user=self.test_user)
 
         view = EntryViewSet.as_view({"get": "retrieve"})
-        response = view(
-            request,
-            username=self.test_user.username,
-            entry_date=self.test_data["entry_date"],
-        )
+        with self.assertNumQueries(1):
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
         response.render()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -149,9 +162,12 @@ class TestEntryViewSet(APITestCase):
                     "finish_time",
                     "milestone_word_count",
                     "words",
+                    "words_digest",
+                    "excerpt",
                     "word_count",
                     "created_date",
                     "modified_date",
+                    "version",
                 ]
             ),
         )
@@ -217,9 +233,12 @@ class TestEntryViewSet(APITestCase):
                     "finish_time",
                     "milestone_word_count",
                     "words",
+                    "words_digest",
+                    "excerpt",
                     "word_count",
                     "created_date",
                     "modified_date",
+                    "version",
                 ]
             ),
         )
@@ -326,9 +345,12 @@ class TestEntryViewSet(APITestCase):
                     "finish_time",
                     "milestone_word_count",
                     "words",
+                    "words_digest",
+                    "excerpt",
                     "word_count",
                     "created_date",
                     "modified_date",
+                    "version",
                 ]
             ),
         )
@@ -546,3 +568,828 @@ class TestEntryViewSet(APITestCase):
         response.render()
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, response.data)
+
+    def test_update_entry_with_edits(self):
+        """ Entry update with edits against the current words returns the edited entry
+        """
+        self.test_entry.words = "one three"
+        self.test_entry.save()
+        del self.test_data["words"]
+        self.test_data["edits"] = [{"position": 4, "insert": "two "}]
+        self.test_data["base_digest"] = words_digest("one three")
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["words"], "one two three")
+        self.assertEqual(response.data["word_count"], 3)
+        self.assertNotIn("edits", response.data)
+        self.assertEqual(Entry.objects.get().words, "one two three")
+
+    def test_update_entry_with_edits_outdated_base(self):
+        """ Entry update with edits against outdated words returns conflict error
+        """
+        self.test_entry.words = "one three"
+        self.test_entry.save()
+        del self.test_data["words"]
+        self.test_data["edits"] = [{"position": 4, "insert": "two "}]
+        self.test_data["base_digest"] = words_digest("one")
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT, response.data)
+        self.assertEqual(Entry.objects.get().words, "one three")
+
+    def test_update_entry_with_edits_concurrently_modified(self):
+        """ Entry update with edits against words modified since the entry was read returns
+        conflict error without overwriting them
+        """
+        self.test_entry.words = "one"
+        self.test_entry.save()
+        stale_entry = Entry.objects.get(pk=self.test_entry.pk)
+        Entry.objects.filter(pk=self.test_entry.pk).update(
+            words="one three",
+            words_digest=words_digest("one three"),
+            version=F("version") + 1,
+        )
+        del self.test_data["words"]
+        self.test_data["edits"] = [{"position": 3, "insert": " two"}]
+        self.test_data["base_digest"] = words_digest("one")
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        with mock.patch.object(EntryViewSet, "get_object", return_value=stale_entry):
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT, response.data)
+        self.assertEqual(Entry.objects.get().words, "one three")
+
+    def test_update_entry_with_edits_out_of_range(self):
+        """ Entry update with edits outside the bounds of the words returns unprocessable error
+        """
+        self.test_entry.words = "one"
+        self.test_entry.save()
+        del self.test_data["words"]
+        self.test_data["edits"] = [{"position": 10, "insert": "two"}]
+        self.test_data["base_digest"] = words_digest("one")
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY, response.data
+        )
+
+    def test_update_entry_with_edits_and_words(self):
+        """ Entry update with both edits and words returns unprocessable error
+        """
+        self.test_entry.save()
+        self.test_data["edits"] = [{"position": 0, "insert": "two"}]
+        self.test_data["base_digest"] = words_digest(self.test_entry.words)
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY, response.data
+        )
+
+    @override_settings(ENTRIES_WRITE_BEHIND=True)
+    def test_update_entry_write_behind(self):
+        """ Buffered entry updates are acknowledged and read through before they are flushed
+        """
+        self.test_entry.save()
+        self.test_data["words"] = "Buffered words."
+        self.addCleanup(get_entry_buffer().cache.clear)
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "update"})
+        with mock.patch.object(EntryWriteBehindBuffer, "_ensure_flusher"):
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["word_count"], 2)
+        self.assertEqual(Entry.objects.get().words, "blah")
+
+        request = factory.get(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/"
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"get": "retrieve"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["words"], "Buffered words.")
+
+        get_entry_buffer().flush()
+        self.assertEqual(Entry.objects.get().words, "Buffered words.")
+
+    @override_settings(ENTRIES_WRITE_BEHIND=True)
+    def test_update_entry_write_behind_flush(self):
+        """ Buffered entry updates requesting a flush are written through to the database
+        """
+        self.test_entry.save()
+        self.test_data["words"] = "Flushed words."
+        self.addCleanup(get_entry_buffer().cache.clear)
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/?flush",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "update"})
+        with mock.patch.object(EntryWriteBehindBuffer, "_ensure_flusher"):
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(Entry.objects.get().words, "Flushed words.")
+
+    def test_retrieve_entry_etag(self):
+        """ Entry retrieval includes the entry version as an ETag
+        """
+        self.test_entry.save()
+        factory = APIRequestFactory()
+        request = factory.get(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/"
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"get": "retrieve"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], 1)
+        self.assertEqual(response["ETag"], '"1"')
+
+    def test_update_entry_if_match(self):
+        """ Entry update with a matching If-Match version increments the version
+        """
+        self.test_entry.save()
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+            HTTP_IF_MATCH='"1"',
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(response["ETag"], '"2"')
+        self.assertEqual(Entry.objects.get().version, 2)
+
+    def test_update_entry_if_match_mismatch(self):
+        """ Entry update with an outdated If-Match version returns precondition failed error
+        """
+        self.test_entry.version = 2
+        self.test_entry.save()
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+            HTTP_IF_MATCH='"1"',
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_412_PRECONDITION_FAILED, response.data
+        )
+        self.assertEqual(Entry.objects.get().words, "blah")
+
+    def test_update_entry_if_match_concurrent_write(self):
+        """ Entry update losing a race with another writer returns precondition failed error
+        """
+        self.test_entry.save()
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+            HTTP_IF_MATCH='"1"',
+        )
+        force_authenticate(request, user=self.test_user)
+
+        def concurrent_write(request, entry):
+            # Another writer updates the entry after it was read by this request
+            Entry.objects.filter(pk=entry.pk).update(version=2, words="Other words")
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        with mock.patch.object(
+            EntryViewSet, "check_object_permissions", side_effect=concurrent_write
+        ):
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
+        response.render()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_412_PRECONDITION_FAILED, response.data
+        )
+        self.assertEqual(Entry.objects.get().words, "Other words")
+
+    def test_update_entry_unchanged_words(self):
+        """ Entry update with unchanged words returns the stored entry without writing it
+        """
+        self.test_entry.save()
+        self.test_data["words"] = self.test_entry.words
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        with CaptureQueriesContext(connection) as queries:
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["version"], 1)
+        self.assertIsNone(response.data["finish_time"])
+        self.assertFalse(
+            [query for query in queries if query["sql"].startswith("UPDATE")]
+        )
+
+    def test_update_entry_changed_columns(self):
+        """ Entry update writes only the columns that changed
+        """
+        self.test_entry.save()
+        self.test_data["words"] = "Updated words."
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        with CaptureQueriesContext(connection) as queries:
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        (update,) = [query for query in queries if query["sql"].startswith("UPDATE")]
+        self.assertIn('"words"', update["sql"])
+        self.assertNotIn('"start_time"', update["sql"])
+        self.assertNotIn('"author_id"', update["sql"])
+        self.assertEqual(
+            Entry.objects.get().words_digest, words_digest("Updated words.")
+        )
+
+    def test_update_entry_prefer_return_minimal(self):
+        """ Entry update preferring a minimal response returns only the calculated fields
+        """
+        self.test_entry.save()
+        self.test_data["words"] = "Updated words."
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+            HTTP_PREFER="return=minimal",
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            set(response.data.keys()),
+            set(
+                [
+                    "word_count",
+                    "words_digest",
+                    "finish_time",
+                    "milestone_time",
+                    "modified_date",
+                    "version",
+                ]
+            ),
+        )
+        self.assertEqual(response.data["word_count"], 2)
+        self.assertEqual(response["Preference-Applied"], "return=minimal")
+        self.assertEqual(Entry.objects.get().words, "Updated words.")
+
+    def test_update_entry_return_minimal_query_param(self):
+        """ Entry update with the return=minimal query parameter returns only the calculated fields
+        """
+        self.test_entry.save()
+        self.test_data["words"] = "Updated words."
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/?return=minimal",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertNotIn("words", response.data)
+        self.assertEqual(response.data["version"], 2)
+
+    def test_retrieve_entry_prefer_return_minimal(self):
+        """ Entry retrieval ignores a preference for a minimal response
+        """
+        self.test_entry.save()
+        factory = APIRequestFactory()
+        request = factory.get(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            HTTP_PREFER="return=minimal",
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"get": "retrieve"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("words", response.data)
+        self.assertFalse(response.has_header("Preference-Applied"))
+
+    def test_list_entries_fields(self):
+        """ Entries list with requested fields returns and queries only those fields
+        """
+        self.test_entry.words = "word " * 100
+        self.test_entry.save()
+        factory = APIRequestFactory()
+        request = factory.get(
+            f"/entries/{self.test_user.username}/?fields=author,entryDate,wordCount,excerpt,unknown"
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"get": "list"})
+        with CaptureQueriesContext(connection) as queries:
+            response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(
+            set(response.data["results"][0].keys()),
+            set(["author", "entry_date", "word_count", "excerpt"]),
+        )
+        self.assertEqual(response.data["results"][0]["excerpt"], ("word " * 40))
+        (select,) = [
+            query for query in queries if '"entries_entry"."entry_date"' in query["sql"]
+        ]
+        self.assertNotIn('"entries_entry"."words"', select["sql"])
+
+    def test_update_entry_excerpt(self):
+        """ Entry update maintains the entry excerpt
+        """
+        self.test_entry.save()
+        self.test_data["words"] = "Updated words."
+
+        factory = APIRequestFactory()
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"patch": "partial_update"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["excerpt"], "Updated words.")
+        self.assertEqual(Entry.objects.get().excerpt, "Updated words.")
+
+    def test_list_entries_cursor_pagination(self):
+        """ Entries list pages through entries newest first with cursors and no count query
+        """
+        for days in range(12):
+            Entry.objects.create(
+                author=self.test_user,
+                entry_date=(datetime.now(timezone.utc) - timedelta(days=days)).date(),
+                entry_timezone="UTC",
+                words="",
+                word_count=0,
+                milestone_word_count=1,
+            )
+        factory = APIRequestFactory()
+        view = EntryViewSet.as_view({"get": "list"})
+
+        request = factory.get(f"/entries/{self.test_user.username}/")
+        force_authenticate(request, user=self.test_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        # No paginator count; the list validators' aggregate counts the entries once
+        self.assertFalse([query for query in queries if "__count" in query["sql"]])
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(response.data["results"][0]["entry_date"], self.today)
+        self.assertIsNone(response.data["previous"])
+
+        request = factory.get(response.data["next"])
+        force_authenticate(request, user=self.test_user)
+        response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_list_entries_limit_offset_pagination(self):
+        """ Entries list paginates with limit and offset when requested
+        """
+        self.test_entry.save()
+        factory = APIRequestFactory()
+        request = factory.get(f"/entries/{self.test_user.username}/?limit=5&offset=0")
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"get": "list"})
+        response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_upsert_entry_creates(self):
+        """ Entry upsert for today when the entry does not exist creates it from the profile defaults
+        """
+        self.client.force_authenticate(user=self.test_user)
+        # SELECT, INSERT ... ON CONFLICT DO NOTHING then SELECT (the profile is already loaded)
+        with self.assertNumQueries(3):
+            response = self.client.put(
+                f"/api/entries/{self.test_user.username}/{self.today}/"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["words"], "")
+        self.assertEqual(response.data["version"], 1)
+        self.assertEqual(
+            response.data["milestone_word_count"],
+            self.test_user.daily_writing_profile.target_milestone_word_count,
+        )
+        self.assertEqual(response["ETag"], '"1"')
+        self.assertEqual(Entry.objects.count(), 1)
+
+    def test_upsert_entry_existing(self):
+        """ Entry upsert for today when the entry exists returns it unchanged without
+        invalidating the entry list cache
+        """
+        self.test_entry.save()
+        self.client.force_authenticate(user=self.test_user)
+        with mock.patch(
+            "entries.serializers.invalidate_entry_list_cache"
+        ) as invalidate:
+            response = self.client.put(
+                f"/api/entries/{self.test_user.username}/{self.today}/"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["words"], "blah")
+        self.assertEqual(Entry.objects.count(), 1)
+        invalidate.assert_not_called()
+
+    def test_upsert_entry_not_today(self):
+        """ Entry upsert for a date other than today returns unprocessable error
+        """
+        self.client.force_authenticate(user=self.test_user)
+        response = self.client.put(
+            f"/api/entries/{self.test_user.username}/{self.tomorrow}/"
+        )
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY, response.data
+        )
+        self.assertFalse(Entry.objects.exists())
+
+    def test_upsert_entry_invalid_date(self):
+        """ Entry upsert for an invalid date returns not found error
+        """
+        self.client.force_authenticate(user=self.test_user)
+        response = self.client.put(
+            f"/api/entries/{self.test_user.username}/2019-02-30/"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_upsert_entry_other_user(self):
+        """ Entry upsert for another user returns forbidden error
+        """
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.put(
+            f"/api/entries/{self.test_user.username}/{self.today}/"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Entry.objects.exists())
+
+    def test_retrieve_entry_not_modified(self):
+        """ Entry retrieval with a matching If-None-Match returns not modified without loading the entry
+        """
+        self.test_entry.save()
+        factory = APIRequestFactory()
+        request = factory.get(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            HTTP_IF_NONE_MATCH='"1"',
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"get": "retrieve"})
+        with CaptureQueriesContext(connection) as queries:
+            response = view(
+                request,
+                username=self.test_user.username,
+                entry_date=self.test_data["entry_date"],
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], '"1"')
+        self.assertTrue(response.has_header("Last-Modified"))
+        (query,) = queries
+        self.assertNotIn('"entries_entry"."words"', query["sql"])
+
+    def test_retrieve_entry_modified(self):
+        """ Entry retrieval with an outdated If-None-Match returns the entry
+        """
+        self.test_entry.version = 2
+        self.test_entry.save()
+        factory = APIRequestFactory()
+        request = factory.get(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            HTTP_IF_NONE_MATCH='"1"',
+        )
+        force_authenticate(request, user=self.test_user)
+
+        view = EntryViewSet.as_view({"get": "retrieve"})
+        response = view(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["words"], "blah")
+        self.assertEqual(response["ETag"], '"2"')
+
+    def test_list_entries_not_modified(self):
+        """ Entries list with a matching If-None-Match returns not modified until an entry changes
+        """
+        self.test_entry.save()
+        factory = APIRequestFactory()
+        view = EntryViewSet.as_view({"get": "list"})
+
+        request = factory.get(f"/entries/{self.test_user.username}/")
+        force_authenticate(request, user=self.test_user)
+        response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        request = factory.get(
+            f"/entries/{self.test_user.username}/", HTTP_IF_NONE_MATCH=etag
+        )
+        force_authenticate(request, user=self.test_user)
+        with self.assertNumQueries(1):
+            response = view(request, username=self.test_user.username)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Entry.objects.filter(pk=self.test_entry.pk).update(version=2)
+        request = factory.get(
+            f"/entries/{self.test_user.username}/", HTTP_IF_NONE_MATCH=etag
+        )
+        force_authenticate(request, user=self.test_user)
+        response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_entries_modified_by_delete(self):
+        """ Entries list with a matching If-None-Match returns the list after an entry is
+        deleted, even when another entry's version makes up the sum of versions
+        """
+        self.test_entry.save()
+        Entry.objects.create(
+            author=self.test_user,
+            start_time=self.start_time,
+            entry_date=(datetime.now(timezone.utc) - timedelta(days=1)).date(),
+            words="yesterday",
+            word_count=1,
+            milestone_word_count=self.test_entry.milestone_word_count,
+        )
+        factory = APIRequestFactory()
+        view = EntryViewSet.as_view({"get": "list"})
+
+        request = factory.get(f"/entries/{self.test_user.username}/")
+        force_authenticate(request, user=self.test_user)
+        response = view(request, username=self.test_user.username)
+        etag = response["ETag"]
+
+        self.test_entry.delete()
+        Entry.objects.update(version=2)
+        request = factory.get(
+            f"/entries/{self.test_user.username}/", HTTP_IF_NONE_MATCH=etag
+        )
+        force_authenticate(request, user=self.test_user)
+        response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    @override_settings(ENTRIES_LIST_CACHE=True)
+    def test_list_entries_cached(self):
+        """ Entries list pages are served from the cache until one of the author's entries changes
+        """
+        self.test_entry.save()
+        self.addCleanup(get_entry_list_cache().cache.clear)
+        factory = APIRequestFactory()
+        view = EntryViewSet.as_view({"get": "list"})
+
+        request = factory.get(f"/entries/{self.test_user.username}/")
+        force_authenticate(request, user=self.test_user)
+        response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = response.content
+        etag = response["ETag"]
+
+        request = factory.get(f"/entries/{self.test_user.username}/")
+        force_authenticate(request, user=self.test_user)
+        with self.assertNumQueries(0):
+            response = view(request, username=self.test_user.username)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, content)
+        self.assertEqual(response["ETag"], etag)
+
+        self.test_data["words"] = "Changed words."
+        request = factory.patch(
+            f"/entries/{self.test_user.username}/{self.test_data['entry_date']}/",
+            self.test_data,
+        )
+        force_authenticate(request, user=self.test_user)
+        response = EntryViewSet.as_view({"patch": "update"})(
+            request,
+            username=self.test_user.username,
+            entry_date=self.test_data["entry_date"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        request = factory.get(
+            f"/entries/{self.test_user.username}/", HTTP_IF_NONE_MATCH=etag
+        )
+        force_authenticate(request, user=self.test_user)
+        response = view(request, username=self.test_user.username)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["results"][0]["excerpt"], "Changed words.")
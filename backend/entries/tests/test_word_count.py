@@ -0,0 +1,54 @@
+import re
+from unittest import TestCase
+
+from entries.word_count import _count_paragraph_words, count_words
+
+
+class TestCountWords(TestCase):
+    """ Unit tests for the paragraph cached word counter
+    """
+
+    def setUp(self):
+        _count_paragraph_words.cache_clear()
+
+    def test_count_words_matches_regex(self):
+        """ Word counts are identical to counting regex word matches over the whole text
+        """
+        texts = [
+            "",
+            "one",
+            "one two three",
+            "  leading and trailing  ",
+            "one\ntwo\n\nthree\r\nfour",
+            "don't re-read the café's naïve 2nd draft_v2",
+            "\n\n\n",
+            "日本語 テキスト and Ελληνικά",
+            "tab\tseparated\x0bvertical\x0cfeed line para",
+        ]
+        for text in texts:
+            self.assertEqual(
+                count_words(text), len(re.findall(r"\w+", text)), repr(text)
+            )
+
+    def test_count_words_none(self):
+        self.assertEqual(count_words(None), 0)
+
+    def test_count_words_reuses_unchanged_paragraphs(self):
+        """ Only changed paragraphs are tokenized when re-counting an edited text
+        """
+        words = "one two\n\nthree four"
+        count_words(words)
+        hits = _count_paragraph_words.cache_info().hits
+
+        self.assertEqual(count_words(words + " five"), 5)
+        self.assertEqual(_count_paragraph_words.cache_info().hits, hits + 2)
+
+    def test_count_words_cache_keyed_by_digest(self):
+        """ The cache holds digests of paragraphs rather than copies of their text
+        """
+        paragraph = "word " * 1000
+        count_words(paragraph)
+
+        self.assertEqual(_count_paragraph_words.cache_info().currsize, 1)
+        self.assertNotIn(paragraph, _count_paragraph_words._counts)
+        self.assertTrue(all(len(key) == 16 for key in _count_paragraph_words._counts))
@@ -1,7 +1,18 @@
+from django.urls import path
 from entries.routers import EntriesRouter
-from entries.views import EntryViewSet
+from entries.views import EntryEventsTokenView, EntryEventsView, EntryViewSet
 
 router = EntriesRouter()
 router.register(prefix=r"entries", viewset=EntryViewSet, basename="entries")
 
-urlpatterns = router.urls
+urlpatterns = [
+    # Ahead of the router's entry detail route, which would otherwise match them
+    path(
+        "entries/<username>/events/", EntryEventsView.as_view(), name="entries-events"
+    ),
+    path(
+        "entries/<username>/events/token/",
+        EntryEventsTokenView.as_view(),
+        name="entries-events-token",
+    ),
+] + router.urls
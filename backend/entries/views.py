@@ -1,12 +1,120 @@
+from api.authentication import CachedJSONWebTokenAuthentication
 from api.permissions import IsOwnerByUsername
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date, parse_etags, quote_etag
+from djangorestframework_camel_case.util import camel_to_underscore
+from entries.authentication import EventsTokenAuthentication, issue_events_token
+from entries.buffers import get_entry_buffer
+from entries.caches import get_entry_list_cache
+from entries.events import stream_events
 from entries.models import Entry
+from entries.pagination import EntryCursorPagination
 from entries.permissions import IsEntryAuthor
+from entries.renderers import EventStreamRenderer
 from entries.serializers import EntrySerializer
 from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+def entry_etag(version):
+    """ Returns the strong ETag for an entry version
+    """
+    return quote_etag(str(version))
+
+
+def set_validators(response, etag, last_modified):
+    """ Sets the ETag and Last-Modified headers of a response
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def conditional_response(request, etag, last_modified):
+    """ Returns a 304 Not Modified response when the request's validators match
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and int(last_modified.timestamp()),
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def parse_if_match(header):
+    """ Parses an If-Match header into a list of entry versions
+
+    Returns None when there is no precondition (no header or `*`). ETags that are not
+    entry versions (e.g. weak ETags) never match.
+    """
+    if not header:
+        return None
+    etags = parse_etags(header)
+    if etags == ["*"]:
+        return None
+    return [int(etag[1:-1]) for etag in etags if etag[1:-1].isdigit()]
+
+
+def prefers_return_minimal(request):
+    """ Whether a request prefers a minimal response
+
+    Either via the `Prefer: return=minimal` header (RFC 7240) or a `return=minimal`
+    query parameter.
+    """
+    preferences = [
+        preference.strip().lower()
+        for preference in request.META.get("HTTP_PREFER", "").split(",")
+    ]
+    return (
+        "return=minimal" in preferences
+        or request.query_params.get("return") == "minimal"
+    )
 
 
 class EntryViewSet(viewsets.ModelViewSet):
+    """
+    Entries API
+
+    When the write-behind buffer is enabled (settings.ENTRIES_WRITE_BEHIND) updates are
+    buffered and reads overlay the buffered values. A `flush` query parameter on an
+    update writes the entry through to the database straight away.
+
+    Entry details carry the entry version as an ETag and updates honour If-Match,
+    responding with 412 Precondition Failed when the entry has since been modified.
+
+    Creates and updates preferring a minimal response (see `prefers_return_minimal`)
+    respond with only the calculated fields rather than echoing the entry's words.
+
+    Entry lists accept a `fields` query parameter (e.g. `?fields=entryDate,excerpt`)
+    limiting both the representation and the columns queried.
+
+    Entry lists are paginated with a cursor (see EntryCursorPagination) unless the
+    `limit` or `offset` query parameters are used.
+
+    PUT on an entry detail for today upserts the entry: it is created from the author's
+    profile defaults if missing and returned either way.
+
+    Entry details and lists carry ETag and Last-Modified validators and answer
+    conditional GETs with 304 Not Modified. Validators come from a lightweight query
+    (see `get_entry_validators` and `get_list_validators`), so a 304 costs neither
+    loading the entries nor serializing them.
+
+    When the entry list cache is enabled (settings.ENTRIES_LIST_CACHE) rendered list
+    pages are cached per author generation (see entries.caches) and the generation
+    doubles as the list ETag.
+    """
+
     lookup_field = "entry_date"
     serializer_class = EntrySerializer
 
@@ -15,12 +123,12 @@ class EntryViewSet(viewsets.ModelViewSet):
         Instantiates and returns the list of permissions to be applied.
 
         - Create action: requesting user is the entry author.
-        - List action: requesting user is the resource owner (e.g.author)
+        - List and upsert actions: requesting user is the resource owner (e.g.author)
         - Other actions: all the above
         """
         if self.action == "create":
             permission_classes = [IsAuthenticated, IsEntryAuthor]
-        elif self.action == "list":
+        elif self.action in ("list", "upsert"):
             permission_classes = [IsAuthenticated, IsOwnerByUsername]
         else:
             permission_classes = [IsAuthenticated, IsOwnerByUsername, IsEntryAuthor]
@@ -32,6 +140,251 @@ class EntryViewSet(viewsets.ModelViewSet):
 
         Entries may be retrieved for the resource owner (e.g. author) identified in the URL
         """
-        return Entry.objects.filter(author__username=self.kwargs["username"]).order_by(
-            "-entry_date"
+        queryset = Entry.objects.filter(
+            author__username=self.kwargs["username"]
+        ).order_by("-entry_date")
+
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset.with_words().select_related("author")
+        if "author" in fields:
+            queryset = queryset.select_related("author")
+        return queryset.only("entry_date", *fields)
+
+    def get_requested_fields(self):
+        """
+        The entry fields requested via the `fields` query parameter of the list action,
+        or None when all fields are requested.
+        """
+        if self.action != "list" or "fields" not in self.request.query_params:
+            return None
+        requested = {
+            camel_to_underscore(field.strip())
+            for field in self.request.query_params["fields"].split(",")
+        }
+        return [
+            field
+            for field in EntrySerializer.Meta.fields
+            if field in requested and field not in ("edits", "base_digest")
+        ]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["entry_buffer"] = get_entry_buffer()
+        context["if_match"] = parse_if_match(self.request.META.get("HTTP_IF_MATCH"))
+        fields = self.get_requested_fields()
+        if fields is not None:
+            context["fields"] = fields
+        if self.request.method not in SAFE_METHODS and prefers_return_minimal(
+            self.request
+        ):
+            context["fields"] = EntrySerializer.Meta.minimal_fields
+        return context
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 300
+            and prefers_return_minimal(request)
+        ):
+            response["Preference-Applied"] = "return=minimal"
+            patch_vary_headers(response, ["Prefer"])
+        return response
+
+    def get_object(self):
+        entry = super().get_object()
+        entry_buffer = get_entry_buffer()
+        if entry_buffer is not None:
+            entry_buffer.read_through(entry)
+        return entry
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            query_params = self.request.query_params
+            if "limit" in query_params or "offset" in query_params:
+                self._paginator = LimitOffsetPagination()
+            else:
+                self._paginator = EntryCursorPagination()
+        return self._paginator
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        entry_buffer = get_entry_buffer()
+        if page is not None and entry_buffer is not None:
+            page = entry_buffer.read_through_many(page)
+        return page
+
+    def perform_update(self, serializer):
+        entry = serializer.save()
+        entry_buffer = serializer.context["entry_buffer"]
+        if entry_buffer is not None and "flush" in self.request.query_params:
+            entry_buffer.flush_entry(entry.pk)
+
+    def get_entry_validators(self):
+        """
+        The ETag and last modified time of the entry identified in the URL, or None if
+        the entry doesn't exist.
+        """
+        entry = (
+            Entry.objects.filter(
+                author__username=self.kwargs["username"],
+                entry_date=self.kwargs[self.lookup_field],
+            )
+            .values("pk", "version", "modified_date")
+            .first()
+        )
+        if entry is None:
+            return None
+        entry_buffer = get_entry_buffer()
+        if entry_buffer is not None:
+            entry.update(entry_buffer.get(entry["pk"]) or {})
+        return entry_etag(entry["version"]), entry["modified_date"]
+
+    def get_list_validators(self):
+        """
+        A fingerprint ETag and last modified time of the entries of the author
+        identified in the URL, or None when not available.
+
+        Entries start at version 1 and their versions only increase, so the sum of
+        versions increases whenever any of the author's entries change. The count and
+        highest pk of the entries are included so that deleting an entry (e.g. from the
+        admin) changes the fingerprint even when later saves make up the sum.
+        With the entry list cache enabled the author's cache generation is used instead,
+        which deletes also bump.
+        """
+        entry_list_cache = get_entry_list_cache()
+        if entry_list_cache is not None:
+            # The requesting user owns the list (see IsOwnerByUsername)
+            generation = entry_list_cache.generation(self.request.user.pk)
+            return quote_etag(f"g{generation}"), None
+        if get_entry_buffer() is not None:
+            # Buffered updates are not reflected in the database yet
+            return None
+        entries = Entry.objects.filter(
+            author__username=self.kwargs["username"]
+        ).aggregate(
+            count=Count("pk"),
+            last=Max("pk"),
+            versions=Sum("version"),
+            modified=Max("modified_date"),
+        )
+        fingerprint = (
+            f"{entries['count']}-{entries['last'] or 0}-{entries['versions'] or 0}"
+        )
+        return quote_etag(fingerprint), entries["modified"]
+
+    def list(self, request, *args, **kwargs):
+        validators = self.get_list_validators()
+        if validators is not None:
+            response = conditional_response(request, *validators)
+            if response is not None:
+                return response
+
+        entry_list_cache = get_entry_list_cache()
+        if entry_list_cache is not None:
+            # Pages are keyed on the list ETag, which embeds the author's generation
+            page = (
+                request.user.pk,
+                validators[0],
+                f"{request.accepted_media_type} {request.get_full_path()}",
+            )
+            cached = entry_list_cache.get(*page)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                set_validators(response, *validators)
+                return response
+
+        response = super().list(request, *args, **kwargs)
+        if validators is not None:
+            set_validators(response, *validators)
+        if entry_list_cache is not None and response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: entry_list_cache.set(*page, rendered)
+            )
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = None
+        if (
+            "HTTP_IF_NONE_MATCH" in request.META
+            or "HTTP_IF_MODIFIED_SINCE" in request.META
+        ):
+            validators = self.get_entry_validators()
+        if validators is not None:
+            response = conditional_response(request, *validators)
+            if response is not None:
+                return response
+        entry = self.get_object()
+        response = Response(self.get_serializer(entry).data)
+        return set_validators(response, entry_etag(entry.version), entry.modified_date)
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        response["ETag"] = entry_etag(response.data["version"])
+        return response
+
+    def upsert(self, request, *args, **kwargs):
+        try:
+            entry_date = parse_date(kwargs[self.lookup_field])
+        except ValueError:
+            entry_date = None
+        if entry_date is None:
+            raise NotFound()
+        serializer = self.get_serializer()
+        entry = serializer.upsert(request.user, entry_date)
+        entry_buffer = get_entry_buffer()
+        if entry_buffer is not None:
+            entry_buffer.read_through(entry)
+        response = Response(serializer.data)
+        response["ETag"] = entry_etag(serializer.instance.version)
+        return response
+
+
+class EntryEventsView(APIView):
+    """
+    Entry events
+
+    Streams the author's entry events (see entries.events) as server-sent events, so
+    devices with an entry open stay in sync without polling. EventSource clients, which
+    can't set headers, may authenticate with a `token` query parameter holding an
+    events token (see EntryEventsTokenView) rather than their JWT.
+
+    Under ASGI the stream is served by entries.consumers.EntryEventsConsumer instead.
+    """
+
+    authentication_classes = (
+        CachedJSONWebTokenAuthentication,
+        EventsTokenAuthentication,
+    )
+    permission_classes = (IsAuthenticated, IsOwnerByUsername)
+    renderer_classes = (EventStreamRenderer,)
+
+    def get(self, request, *args, **kwargs):
+        response = StreamingHttpResponse(
+            stream_events(request.user.pk), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class EntryEventsTokenView(APIView):
+    """
+    Entry events token
+
+    Issues a short lived token authenticating only the author's entry events stream,
+    for the `token` query parameter of EntryEventsView. Query parameters are recorded
+    in access logs, so the stream doesn't accept the author's JWT there.
+    """
+
+    permission_classes = (IsAuthenticated, IsOwnerByUsername)
+
+    def post(self, request, *args, **kwargs):
+        return Response(
+            {
+                "token": issue_events_token(request.user),
+                "expires_in": settings.ENTRIES_EVENTS_TOKEN_MAX_AGE,
+            }
         )
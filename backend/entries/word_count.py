@@ -0,0 +1,70 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Words never span a line break (`\n` is not a word character), so counting per
+# paragraph and summing gives the same result as counting the whole text at once.
+PARAGRAPH_SEPARATOR = "\n"
+PARAGRAPH_CACHE_SIZE = 4096
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ParagraphWordCounter:
+    """ Counts the words in a paragraph, with a least recently used cache of counts
+
+    Counts are keyed by a digest of the paragraph rather than the paragraph itself, so
+    the cache never holds copies of entry texts. Exposes `cache_info` and `cache_clear`
+    like functools.lru_cache.
+    """
+
+    def __init__(self, maxsize=PARAGRAPH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = 0
+
+    def __call__(self, paragraph):
+        key = hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                self._hits += 1
+                return count
+            self._misses += 1
+        count = sum(1 for _ in WORD_PATTERN.finditer(paragraph))
+        with self._lock:
+            self._counts[key] = count
+            if len(self._counts) > self.maxsize:
+                self._counts.popitem(last=False)
+        return count
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._counts))
+
+    def cache_clear(self):
+        with self._lock:
+            self._counts.clear()
+            self._hits = self._misses = 0
+
+
+_count_paragraph_words = ParagraphWordCounter()
+
+
+def count_words(words):
+    """ Counts the words in a text, equivalent to `len(re.findall(r"\\w+", words))`
+
+    Matches are counted without being collected and paragraph counts are cached by
+    digest, so re-counting an entry after an edit only tokenizes changed paragraphs.
+    """
+    if not words:
+        return 0
+    return sum(
+        _count_paragraph_words(paragraph)
+        for paragraph in words.split(PARAGRAPH_SEPARATOR)
+    )
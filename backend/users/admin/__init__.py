@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.http import Http404, JsonResponse
+from django.urls import path
 from django.utils.translation import gettext_lazy as _
 from users.admin.actions import send_invite
+from users.invites import get_invite_job
 from users.models import DailyWritingProfile, User
 
 
@@ -18,11 +21,11 @@ class InviteFilter(admin.SimpleListFilter):
 
     def queryset(self, request, queryset):
         if self.value() == "requested":
-            return queryset.filter(groups__name__in=["Invite Requested"])
+            return queryset.filter(invite_state=User.INVITE_REQUESTED)
         if self.value() == "invited":
-            return queryset.filter(groups__name__in=["Invited"])
+            return queryset.filter(invite_state=User.INVITE_INVITED)
         if self.value() == "accepted":
-            return queryset.filter(groups__name__in=["Invite Accepted"])
+            return queryset.filter(invite_state=User.INVITE_ACCEPTED)
 
 
 @admin.register(User)
@@ -31,6 +34,24 @@ class DailyWritingUserAdmin(UserAdmin):
     actions = [send_invite]
     list_filter = (InviteFilter,)
 
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                "invite-jobs/<uuid:job_id>/",
+                self.admin_site.admin_view(self.invite_job_view),
+                name=f"{opts.app_label}_{opts.model_name}_invite_job",
+            )
+        ] + super().get_urls()
+
+    def invite_job_view(self, request, job_id):
+        """ Progress of an invite job run by the worker (see users.invites.start_invite_job)
+        """
+        job = get_invite_job(job_id)
+        if job is None:
+            raise Http404
+        return JsonResponse(job)
+
 
 @admin.register(DailyWritingProfile)
 class DailyWritingProfileAdmin(admin.ModelAdmin):
@@ -1,14 +1,14 @@
-from allauth.account.adapter import get_adapter
-from allauth.account.models import EmailAddress
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.admin import helpers
-from django.contrib.admin.models import CHANGE, LogEntry
 from django.contrib.admin.utils import model_ngettext
-from django.contrib.auth.models import Group
-from django.contrib.contenttypes.models import ContentType
 from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
+from users.invites import invite_users, start_invite_job
+from users.models import User
 
 
 def send_invite(modeladmin, request, queryset):
@@ -20,27 +20,37 @@ def send_invite(modeladmin, request, queryset):
 
     # Populate invitable_objects, a data structure of all related objects that
     # will also be deleted.
-    invitable_groups = ["Invite Requested", "Invited"]
-    inviteable_users = queryset.filter(groups__name__in=invitable_groups)
-    protected = queryset.exclude(groups__name__in=invitable_groups)
+    invitable_states = [User.INVITE_REQUESTED, User.INVITE_INVITED]
+    inviteable_users = queryset.filter(invite_state__in=invitable_states)
+    protected = queryset.exclude(invite_state__in=invitable_states)
 
     # The user has already confirmed the deletion.
     # Do the deletion and return None to display the change list view again.
     if request.POST.get("post") and inviteable_users and not protected:
-        inviteable_user_count = inviteable_users.count()
-        for user in queryset:
-            obj_display = str(user)
-            get_adapter().send_invite_email(user)
-            user.groups.remove(Group.objects.get(name="Invite Requested"))
-            user.groups.add(Group.objects.get(name="Invited"))
-            LogEntry.objects.log_action(
-                user_id=request.user.pk,
-                content_type_id=ContentType.objects.get_for_model(user).pk,
-                object_id=user.pk,
-                object_repr=str(user),
-                action_flag=CHANGE,
-                change_message="Sent invite to user",
+        user_ids = list(queryset.values_list("pk", flat=True))
+        inviteable_user_count = len(user_ids)
+        if inviteable_user_count > settings.USERS_BULK_INVITE_BACKGROUND_THRESHOLD:
+            job_id = start_invite_job(user_ids, request.user.pk)
+            modeladmin.message_user(
+                request,
+                format_html(
+                    _("Inviting {count} {items} in the background. {progress}"),
+                    count=inviteable_user_count,
+                    items=model_ngettext(modeladmin.opts, inviteable_user_count),
+                    progress=format_html(
+                        '<a href="{}">{}</a>',
+                        reverse(
+                            f"admin:{app_label}_{opts.model_name}_invite_job",
+                            args=[job_id],
+                        ),
+                        _("Progress"),
+                    ),
+                ),
+                messages.INFO,
             )
+            return None
+
+        invite_users(user_ids, request.user.pk)
         modeladmin.message_user(
             request,
             _("Successfully invited %(count)d %(items)s.")
@@ -0,0 +1,49 @@
+from api.caches import SharedCacheWrapper
+
+
+def get_profile_cache():
+    """ Returns the process wide daily writing profile cache, or None when disabled
+    """
+    return ProfileCache.get_instance()
+
+
+def invalidate_profile_cache(user_id):
+    """ Invalidates the cached profile of a user, if caching is enabled
+    """
+    profile_cache = get_profile_cache()
+    if profile_cache is not None:
+        profile_cache.delete(user_id)
+
+
+class ProfileCache(SharedCacheWrapper):
+    """ Cache of daily writing profile field values, keyed by user
+
+    Entries are deleted whenever a profile is saved or deleted. A profile read from
+    the database while it's being saved may still be cached with the previous values,
+    hence the short timeout.
+    """
+
+    setting = "USERS_PROFILE_CACHE"
+    default_timeout = 60
+
+    KEY = "users:profile:{user_id}"
+
+    def _key(self, user_id):
+        return self.KEY.format(user_id=user_id)
+
+    def get(self, user_id):
+        """ Returns the cached field values (by attname) of a user's profile, or None
+        """
+        return self.cache.get(self._key(user_id))
+
+    def set(self, profile):
+        """ Caches the concrete field values of a profile
+        """
+        values = {
+            field.attname: getattr(profile, field.attname)
+            for field in profile._meta.concrete_fields
+        }
+        self.cache.set(self._key(profile.user_id), values, self.timeout)
+
+    def delete(self, user_id):
+        self.cache.delete(self._key(user_id))
@@ -7,8 +7,8 @@ UserModel = get_user_model()
 class DailyWritingPasswordResetForm(PasswordResetForm):
     """ PasswordResetForm extends Django's PasswordResetForm
 
-    Overrides `get_users` to additionally filter out users that are not in the
-    "Invite Accepted" group.
+    Overrides `get_users` to additionally filter out users that haven't accepted
+    their invite.
     """
 
     def get_users(self, email):
@@ -18,7 +18,7 @@ class DailyWritingPasswordResetForm(PasswordResetForm):
             **{
                 "%s__iexact" % UserModel.get_email_field_name(): email,
                 "is_active": True,
-                "groups__name__in": ["Invite Accepted"],
+                "invite_state": UserModel.INVITE_ACCEPTED,
             }
         )
         return (u for u in active_users if u.has_usable_password())
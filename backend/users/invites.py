@@ -0,0 +1,153 @@
+import logging
+from datetime import timedelta
+
+from allauth.account.adapter import get_adapter
+from allauth.account.models import EmailAddress
+from api.mail import queue_mass_mail
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from users.models import InviteJob, get_invite_group_ids
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+STALE_JOB_AGE = timedelta(minutes=10)
+
+
+def invite_users(user_ids, actor_id, progress=None):
+    """ Invites users in bulk, returning the number of users invited
+
+    Users are processed in batches of BATCH_SIZE, each in a single transaction: invite
+    emails are queued with one insert (see api.mail), group memberships and invite
+    states are moved from Invite Requested to Invited with set-based deletes, inserts
+    and updates, and admin log entries are written with one insert.
+
+    `progress` is called within each batch's transaction with the number of users
+    processed so far and the total.
+    """
+    UserModel = get_user_model()
+    Membership = UserModel.groups.through
+    group_ids = get_invite_group_ids()
+    content_type_id = ContentType.objects.get_for_model(UserModel).pk
+    adapter = get_adapter()
+
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        batch = user_ids[start : start + BATCH_SIZE]
+        with transaction.atomic():
+            users = UserModel.objects.filter(pk__in=batch).only("pk", "username")
+            queue_mass_mail(
+                adapter.get_invite_email(email_address)
+                for email_address in EmailAddress.objects.filter(user_id__in=batch)
+            )
+            Membership.objects.filter(
+                user_id__in=batch, group_id=group_ids[UserModel.INVITE_REQUESTED]
+            ).delete()
+            Membership.objects.bulk_create(
+                [
+                    Membership(
+                        user_id=user_id, group_id=group_ids[UserModel.INVITE_INVITED]
+                    )
+                    for user_id in batch
+                ],
+                ignore_conflicts=True,
+            )
+            users.update(invite_state=UserModel.INVITE_INVITED)
+            action_time = timezone.now()
+            LogEntry.objects.bulk_create(
+                LogEntry(
+                    action_time=action_time,
+                    user_id=actor_id,
+                    content_type_id=content_type_id,
+                    object_id=str(user.pk),
+                    object_repr=str(user)[:200],
+                    action_flag=CHANGE,
+                    change_message="Sent invite to user",
+                )
+                for user in users
+            )
+            if progress is not None:
+                progress(min(start + BATCH_SIZE, len(user_ids)), len(user_ids))
+    return len(user_ids)
+
+
+def start_invite_job(user_ids, actor_id):
+    """ Queues users to be invited by the worker process, returning a job id for
+    get_invite_job (see run_invite_jobs)
+    """
+    user_ids = list(user_ids)
+    job = InviteJob.objects.create(
+        actor_id=actor_id,
+        user_ids="\n".join(str(user_id) for user_id in user_ids),
+        total=len(user_ids),
+    )
+    return job.pk
+
+
+def get_invite_job(job_id):
+    """ Returns the status, invited and total counts of an invite job, or None
+    """
+    return (
+        InviteJob.objects.filter(pk=job_id).values("status", "invited", "total").first()
+    )
+
+
+def run_invite_jobs():
+    """ Runs the queued invite jobs, returning the number of jobs run
+
+    Jobs are claimed with a conditional update so concurrent workers skip each other's
+    jobs. Progress is saved with each batch, so a job left running by a worker that
+    stopped is resumed after its last batch once it hasn't progressed for
+    STALE_JOB_AGE.
+    """
+    run = 0
+    while True:
+        job = _claim_invite_job()
+        if job is None:
+            return run
+        _run_invite_job(job)
+        run += 1
+
+
+def _claim_invite_job():
+    jobs = InviteJob.objects.filter(
+        Q(status=InviteJob.STATUS_QUEUED)
+        | Q(
+            status=InviteJob.STATUS_RUNNING,
+            modified_date__lt=timezone.now() - STALE_JOB_AGE,
+        )
+    ).order_by("created_date")
+    for job in jobs:
+        claimed_date = timezone.now()
+        if InviteJob.objects.filter(
+            pk=job.pk, status=job.status, modified_date=job.modified_date
+        ).update(status=InviteJob.STATUS_RUNNING, modified_date=claimed_date):
+            job.status = InviteJob.STATUS_RUNNING
+            job.modified_date = claimed_date
+            return job
+    return None
+
+
+def _run_invite_job(job):
+    jobs = InviteJob.objects.filter(pk=job.pk)
+    resumed = job.invited
+    try:
+        invite_users(
+            job.user_id_list[resumed:],
+            job.actor_id,
+            progress=lambda invited, total: jobs.update(
+                invited=resumed + invited, modified_date=timezone.now()
+            ),
+        )
+        jobs.update(
+            status=InviteJob.STATUS_DONE,
+            invited=job.total,
+            modified_date=timezone.now(),
+        )
+    except Exception:
+        logger.exception("Error running invite job %s", job.pk)
+        jobs.update(status=InviteJob.STATUS_FAILED, modified_date=timezone.now())
@@ -0,0 +1,41 @@
+# Generated by Django 3.0.1 on 2026-10-18 15:37
+
+from django.db import migrations, models
+
+# Invite states by group name, in order of precedence
+INVITE_STATE_GROUPS = (
+    ("requested", "Invite Requested"),
+    ("invited", "Invited"),
+    ("accepted", "Invite Accepted"),
+)
+
+
+def populate_invite_state(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    for state, group_name in INVITE_STATE_GROUPS:
+        User.objects.filter(groups__name=group_name).update(invite_state=state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="invite_state",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("requested", "Invite Requested"),
+                    ("invited", "Invited"),
+                    ("accepted", "Invite Accepted"),
+                ],
+                db_index=True,
+                max_length=10,
+            ),
+        ),
+        migrations.RunPython(populate_invite_state, migrations.RunPython.noop),
+    ]
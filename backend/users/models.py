@@ -1,15 +1,126 @@
+import logging
+import uuid
+
+from api.models import BaseModel
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, Group
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from timezone_field import TimeZoneField
+from users.caches import get_profile_cache, invalidate_profile_cache
+
+logger = logging.getLogger(__name__)
 
 
 class User(AbstractUser):
+    INVITE_REQUESTED = "requested"
+    INVITE_INVITED = "invited"
+    INVITE_ACCEPTED = "accepted"
+    INVITE_STATE_CHOICES = (
+        (INVITE_REQUESTED, "Invite Requested"),
+        (INVITE_INVITED, "Invited"),
+        (INVITE_ACCEPTED, "Invite Accepted"),
+    )
+
     verbose_name = "user"
     verbose_name_plural = "users"
 
+    # Denormalised from membership of the invite groups (see INVITE_STATE_GROUPS)
+    invite_state = models.CharField(
+        max_length=10, choices=INVITE_STATE_CHOICES, blank=True, db_index=True
+    )
+
+    def set_invite_state(self, invite_state):
+        """ Moves the user to the group of an invite state and saves the invite state
+        """
+        group_ids = get_invite_group_ids()
+        Membership = User.groups.through
+        Membership.objects.filter(
+            user_id=self.pk,
+            group_id__in=[
+                group_id
+                for state, group_id in group_ids.items()
+                if state != invite_state
+            ],
+        ).delete()
+        Membership.objects.bulk_create(
+            [Membership(user_id=self.pk, group_id=group_ids[invite_state])],
+            ignore_conflicts=True,
+        )
+        self.invite_state = invite_state
+        User.objects.filter(pk=self.pk).update(invite_state=invite_state)
+
+
+# Invite states by group name, in order of precedence
+INVITE_STATE_GROUPS = {
+    User.INVITE_REQUESTED: "Invite Requested",
+    User.INVITE_INVITED: "Invited",
+    User.INVITE_ACCEPTED: "Invite Accepted",
+}
+
+_invite_group_ids = None
+
+
+def get_invite_group_ids():
+    """ Returns the group id of each invite state, resolved once per process
+    """
+    global _invite_group_ids
+    if _invite_group_ids is None:
+        group_ids = dict(
+            Group.objects.filter(name__in=INVITE_STATE_GROUPS.values()).values_list(
+                "name", "pk"
+            )
+        )
+        if len(group_ids) < len(INVITE_STATE_GROUPS):
+            # Groups not loaded yet (see fixtures/seed.json); don't remember that
+            return {
+                state: group_ids[name]
+                for state, name in INVITE_STATE_GROUPS.items()
+                if name in group_ids
+            }
+        _invite_group_ids = {
+            state: group_ids[name] for state, name in INVITE_STATE_GROUPS.items()
+        }
+    return _invite_group_ids
+
+
+def sync_invite_states(user_ids):
+    """ Recomputes the invite state of users from their membership of the invite groups
+    """
+    users = User.objects.filter(pk__in=user_ids)
+    users.update(invite_state="")
+    for state, group_id in get_invite_group_ids().items():
+        users.filter(groups=group_id).update(invite_state=state)
+
+
+class DailyWritingProfileManager(models.Manager):
+    def get_for_user(self, user):
+        """ Returns a user's profile, reading through the profile cache when enabled
+
+        The profile is also cached on the user so later accesses of
+        `user.daily_writing_profile` don't query. A missing profile is created.
+        """
+        if (
+            type(user).daily_writing_profile.is_cached(user)
+            and user.daily_writing_profile.pk is not None
+        ):
+            return user.daily_writing_profile
+
+        profile_cache = get_profile_cache()
+        values = profile_cache.get(user.pk) if profile_cache is not None else None
+        if values is not None:
+            profile = self.model.from_db(self.db, list(values), list(values.values()))
+        else:
+            profile, created = self.get_or_create(user=user)
+            if created:
+                # Shouldn't occur: See create_or_update_user_profile signal
+                logger.error("User %s profile missing!?", user.pk)
+            if profile_cache is not None:
+                profile_cache.set(profile)
+        user.daily_writing_profile = profile
+        return profile
+
 
 class DailyWritingProfile(models.Model):
     user = models.OneToOneField(
@@ -18,9 +129,110 @@ class DailyWritingProfile(models.Model):
     timezone = TimeZoneField(default="UTC")
     target_milestone_word_count = models.PositiveIntegerField(default=700)
 
+    objects = DailyWritingProfileManager()
+
+    TRACKED_FIELDS = ("timezone", "target_milestone_word_count")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        profile = super().from_db(db, field_names, values)
+        profile._snapshot()
+        return profile
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot()
+
+    def _snapshot(self):
+        self._saved_values = {
+            field: getattr(self, field)
+            for field in self.TRACKED_FIELDS
+            if field in self.__dict__
+        }
+
+    def is_dirty(self):
+        """ Whether the profile is unsaved or has changes since it was loaded or saved
+        """
+        if self._state.adding or not hasattr(self, "_saved_values"):
+            return True
+        return any(
+            getattr(self, field) != value for field, value in self._saved_values.items()
+        )
+
+
+class InviteJob(BaseModel):
+    """ A bulk invite run by the worker process (see users.invites)
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    actor = models.ForeignKey(User, on_delete=models.PROTECT, related_name="+")
+    user_ids = models.TextField(help_text="One user id per line")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    invited = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "modified_date"])]
+
+    def __str__(self):
+        return f"Invite {self.total} users ({self.status})"
+
+    @property
+    def user_id_list(self):
+        return [int(user_id) for user_id in self.user_ids.splitlines()]
+
 
 @receiver(post_save, sender=get_user_model())
 def create_or_update_user_profile(sender, instance, created, **kwargs):
+    """ Creates the profile of new users and saves unsaved changes to loaded profiles
+
+    Profiles which haven't been loaded, or are unchanged, aren't touched so that user
+    saves such as login timestamp updates don't also query the profile table.
+    """
     if created:
         DailyWritingProfile.objects.create(user=instance)
-    instance.daily_writing_profile.save()
+    elif sender.daily_writing_profile.is_cached(instance):
+        profile = instance.daily_writing_profile
+        if profile.is_dirty():
+            profile.save()
+
+
+@receiver(post_save, sender=DailyWritingProfile)
+@receiver(post_delete, sender=DailyWritingProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    invalidate_profile_cache(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def sync_user_invite_state(sender, instance, action, reverse, pk_set, **kwargs):
+    """ Keeps User.invite_state in sync with changes to invite group membership
+    """
+    invite_group_ids = set(get_invite_group_ids().values())
+    if not reverse:
+        if action == "post_clear" or (
+            action in ("post_add", "post_remove") and pk_set & invite_group_ids
+        ):
+            sync_invite_states([instance.pk])
+            instance.refresh_from_db(fields=["invite_state"])
+    elif instance.pk in invite_group_ids:
+        if action == "pre_clear":
+            instance._invite_user_ids = list(
+                instance.user_set.values_list("pk", flat=True)
+            )
+        elif action == "post_clear":
+            sync_invite_states(getattr(instance, "_invite_user_ids", []))
+        elif action in ("post_add", "post_remove"):
+            sync_invite_states(pk_set)
@@ -2,16 +2,16 @@ import pytz
 
 from allauth.account import app_settings as allauth_settings
 from allauth.account.adapter import get_adapter
-from allauth.account.models import EmailConfirmationHMAC
+from allauth.account.models import EmailAddress, EmailConfirmationHMAC
 from allauth.utils import get_username_max_length
 from api.exceptions import UnprocessibleError
-from django.contrib.auth.models import Group
+from django.core import signing
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_auth.serializers import PasswordResetSerializer
 from rest_framework import serializers
 from users.forms import DailyWritingPasswordResetForm
-from users.models import DailyWritingProfile
+from users.models import DailyWritingProfile, User
 
 
 class TimezoneField(serializers.Field):
@@ -56,6 +56,26 @@ class InviteRequestSerializer(serializers.Serializer):
         return get_adapter().new_user_invite_request(request, self)
 
 
+def resolve_invite_token(token):
+    """
+    Returns the EmailConfirmationHMAC of an invite token, or None if it is invalid
+
+    As per `EmailConfirmationHMAC.from_key` though the email address is loaded along
+    with its user.
+    """
+    try:
+        pk = signing.loads(
+            token,
+            max_age=60 * 60 * 24 * allauth_settings.EMAIL_CONFIRMATION_EXPIRE_DAYS,
+            salt=allauth_settings.SALT,
+        )
+        return EmailConfirmationHMAC(
+            EmailAddress.objects.select_related("user").get(pk=pk)
+        )
+    except (signing.BadSignature, EmailAddress.DoesNotExist):
+        return None
+
+
 class InviteTokenSerializer(serializers.Serializer):
     """
     Invite token serializer
@@ -63,6 +83,17 @@ class InviteTokenSerializer(serializers.Serializer):
 
     token = serializers.CharField(required=True)
 
+    def get_email_confirmation(self, token):
+        """
+        Returns the EmailConfirmationHMAC of the token (see `resolve_invite_token`)
+
+        The token is resolved once and shared by validation and save.
+        """
+        if getattr(self, "_email_confirmation_token", None) != token:
+            self._email_confirmation = resolve_invite_token(token)
+            self._email_confirmation_token = token
+        return self._email_confirmation
+
     def validate_token(self, token):
         """
         Validates the token is valid and associated with an invited user
@@ -70,12 +101,10 @@ class InviteTokenSerializer(serializers.Serializer):
         Returns generic not invalid token error avoid exposing the validity
         of a given token and related email address.
         """
-        email_confirmation = EmailConfirmationHMAC.from_key(token)
+        email_confirmation = self.get_email_confirmation(token)
         if (
             not email_confirmation
-            or not email_confirmation.email_address.user.groups.filter(
-                name="Invited"
-            ).exists()
+            or email_confirmation.email_address.user.invite_state != User.INVITE_INVITED
         ):
             raise serializers.ValidationError(detail=_("Invalid token"), code="invalid")
         return token
@@ -112,10 +141,8 @@ class InviteAcceptanceSerializer(InviteTokenSerializer):
         """ Validate related fields
         """
         # If the username fields doesn't match the user's existing username, check for uniqueness.
-        if (
-            EmailConfirmationHMAC.from_key(data["token"]).email_address.user.username
-            != data["username"]
-        ):
+        user = self.get_email_confirmation(data["token"]).email_address.user
+        if user.username != data["username"]:
             get_adapter().clean_username(data["username"])
         return data
 
@@ -141,14 +168,13 @@ class InviteAcceptanceSerializer(InviteTokenSerializer):
             self.get_cleaned_data()
         )  # referenced by Account Adapter during save_user
         token = self.cleaned_data["token"]
-        email_address = EmailConfirmationHMAC.from_key(token).email_address
+        email_address = self.get_email_confirmation(token).email_address
         self.cleaned_data["email"] = email_address.email
         adapter = get_adapter()
         # Confirm email via adapter instead of EmailConfirmationHMAC so that no email to user is triggered
         adapter.confirm_email(request, email_address)
         adapter.save_user(request, email_address.user, self)
-        email_address.user.groups.add(Group.objects.get(name="Invite Accepted"))
-        email_address.user.groups.remove(Group.objects.get(name="Invited"))
+        email_address.user.set_invite_state(User.INVITE_ACCEPTED)
 
 
 class AuthJWTSerializer(serializers.Serializer):
@@ -1,4 +1,5 @@
 from allauth.account.models import EmailAddress
+from api.mail import send_queued_mail
 from django.contrib.admin import helpers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
@@ -81,6 +82,7 @@ class TestDailyWritingUserAdmin(TestCase):
             .groups.filter(name="Invite Requested")
             .exists()
         )
+        send_queued_mail()
         self.assertEqual(len(mail.outbox), 2)
         self.assertEqual(
             mail.outbox[0].subject, "[Daily Writing] Your invitation to Daily Writing"
@@ -0,0 +1,178 @@
+from unittest import mock
+
+from allauth.account.models import EmailAddress
+from api.models import OutboundEmail
+from django.contrib.admin import helpers
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from users.invites import (
+    STALE_JOB_AGE,
+    get_invite_job,
+    invite_users,
+    run_invite_jobs,
+    start_invite_job,
+)
+from users.models import InviteJob
+
+UserModel = get_user_model()
+
+
+class TestInviteUsers(TestCase):
+    """ Unit tests for the bulk invite pipeline
+    """
+
+    fixtures = ["dailywriting/fixtures/seed.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = UserModel.objects.create_superuser(
+            username="super", password="secret", email="super@example.com"
+        )
+
+    def create_requested_users(self, count, offset=0):
+        users = []
+        for i in range(offset, offset + count):
+            user = UserModel.objects.create(
+                email=f"tester{i}@tester.com", username=f"tester{i}"
+            )
+            user.groups.add(Group.objects.get(name="Invite Requested"))
+            EmailAddress.objects.create(email=user.email, user=user)
+            users.append(user)
+        return users
+
+    def test_invite_users(self):
+        """ Invited users are moved to the Invited group, emailed and logged
+        """
+        users = self.create_requested_users(2)
+        progress = mock.Mock()
+
+        invited = invite_users([user.pk for user in users], self.superuser.pk, progress)
+
+        self.assertEqual(invited, 2)
+        for user in users:
+            self.assertEqual(
+                list(user.groups.values_list("name", flat=True)), ["Invited"]
+            )
+        self.assertEqual(
+            sorted(
+                email.recipients
+                for email in OutboundEmail.objects.filter(
+                    subject="[Daily Writing] Your invitation to Daily Writing"
+                )
+            ),
+            ["tester0@tester.com", "tester1@tester.com"],
+        )
+        self.assertEqual(
+            LogEntry.objects.filter(
+                user=self.superuser, change_message="Sent invite to user"
+            ).count(),
+            2,
+        )
+        progress.assert_called_once_with(2, 2)
+
+    def test_invite_users_queries(self):
+        """ The number of queries doesn't grow with the number of users
+        """
+        few = self.create_requested_users(2)
+        many = self.create_requested_users(6, offset=2)
+
+        with CaptureQueriesContext(connection) as few_queries:
+            invite_users([user.pk for user in few], self.superuser.pk)
+        with CaptureQueriesContext(connection) as many_queries:
+            invite_users([user.pk for user in many], self.superuser.pk)
+
+        self.assertEqual(len(many_queries), len(few_queries))
+
+    def test_start_invite_job(self):
+        """ Invite jobs are queued for the worker, which reports their progress
+        """
+        users = self.create_requested_users(2)
+
+        job_id = start_invite_job([user.pk for user in users], self.superuser.pk)
+
+        self.assertEqual(
+            get_invite_job(job_id), {"status": "queued", "invited": 0, "total": 2}
+        )
+        self.assertEqual(run_invite_jobs(), 1)
+        self.assertEqual(
+            get_invite_job(job_id), {"status": "done", "invited": 2, "total": 2}
+        )
+        self.assertEqual(run_invite_jobs(), 0)
+
+    def test_run_invite_jobs_resumes_stale(self):
+        """ Jobs left running by a stopped worker are resumed after their last batch
+        """
+        users = self.create_requested_users(2)
+        job_id = start_invite_job([user.pk for user in users], self.superuser.pk)
+        InviteJob.objects.filter(pk=job_id).update(
+            status=InviteJob.STATUS_RUNNING, invited=1
+        )
+
+        self.assertEqual(run_invite_jobs(), 0)
+
+        InviteJob.objects.filter(pk=job_id).update(
+            modified_date=timezone.now() - STALE_JOB_AGE
+        )
+
+        self.assertEqual(run_invite_jobs(), 1)
+        self.assertEqual(
+            get_invite_job(job_id), {"status": "done", "invited": 2, "total": 2}
+        )
+        self.assertEqual(
+            list(OutboundEmail.objects.values_list("recipients", flat=True)),
+            [users[1].email],
+        )
+
+    def test_run_invite_jobs_failed(self):
+        """ Jobs that raise an error are marked failed with their progress
+        """
+        users = self.create_requested_users(2)
+        job_id = start_invite_job([user.pk for user in users], self.superuser.pk)
+
+        with mock.patch(
+            "users.invites.invite_users", side_effect=Exception
+        ), self.assertLogs("users.invites", "ERROR"):
+            run_invite_jobs()
+
+        self.assertEqual(
+            get_invite_job(job_id), {"status": "failed", "invited": 0, "total": 2}
+        )
+
+    @override_settings(USERS_BULK_INVITE_BACKGROUND_THRESHOLD=1)
+    def test_admin_send_invite_background(self):
+        """ Large admin invite selections run in the background with a progress link
+        """
+        users = self.create_requested_users(2)
+        self.client.force_login(self.superuser)
+        user_changelist_url = reverse("admin:users_user_changelist")
+
+        response = self.client.post(
+            user_changelist_url,
+            {
+                helpers.ACTION_CHECKBOX_NAME: [user.pk for user in users],
+                "action": "send_invite",
+                "index": 0,
+                "post": "yes",
+            },
+        )
+
+        self.assertRedirects(response, user_changelist_url)
+        message = str(list(get_messages(response.wsgi_request))[0])
+        self.assertIn("Inviting 2 users in the background.", message)
+        progress_url = message.split('href="')[1].split('"')[0]
+        self.assertEqual(
+            self.client.get(progress_url).json(),
+            {"status": "queued", "invited": 0, "total": 2},
+        )
+        run_invite_jobs()
+        self.assertEqual(
+            self.client.get(progress_url).json(),
+            {"status": "done", "invited": 2, "total": 2},
+        )
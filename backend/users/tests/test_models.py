@@ -0,0 +1,150 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from users.caches import ProfileCache, get_profile_cache
+from users.models import DailyWritingProfile, get_invite_group_ids
+
+UserModel = get_user_model()
+
+
+class TestDailyWritingProfile(TestCase):
+    """ Unit tests for the DailyWritingProfile model and user profile signal
+    """
+
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+
+    def test_user_created_profile(self):
+        """ Creating a user creates their profile
+        """
+        self.assertTrue(
+            DailyWritingProfile.objects.filter(user=self.test_user).exists()
+        )
+
+    def test_user_save_profile_not_loaded(self):
+        """ Saving a user without loading their profile doesn't query the profile
+        """
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        user.last_login = timezone.now()
+
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+    def test_user_save_profile_unchanged(self):
+        """ Saving a user with an unchanged profile doesn't save the profile
+        """
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        self.assertFalse(user.daily_writing_profile.is_dirty())
+
+        with self.assertNumQueries(1):
+            user.save()
+
+    def test_user_save_profile_changed(self):
+        """ Saving a user with a changed profile saves the profile
+        """
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        user.daily_writing_profile.target_milestone_word_count = 3
+
+        with self.assertNumQueries(2):
+            user.save()
+
+        self.assertFalse(user.daily_writing_profile.is_dirty())
+        self.assertEqual(
+            DailyWritingProfile.objects.get(
+                user=self.test_user
+            ).target_milestone_word_count,
+            3,
+        )
+
+    @override_settings(USERS_PROFILE_CACHE=True)
+    def test_get_for_user_cached(self):
+        """ Profiles are read through the profile cache until they are saved
+        """
+        self.addCleanup(get_profile_cache().cache.clear)
+
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        with self.assertNumQueries(1):
+            DailyWritingProfile.objects.get_for_user(user)
+
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        with self.assertNumQueries(0):
+            profile = DailyWritingProfile.objects.get_for_user(user)
+            self.assertIs(user.daily_writing_profile, profile)
+            self.assertFalse(profile.is_dirty())
+
+        profile.target_milestone_word_count = 3
+        profile.save()
+
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        with self.assertNumQueries(1):
+            profile = DailyWritingProfile.objects.get_for_user(user)
+        self.assertEqual(profile.target_milestone_word_count, 3)
+
+    @override_settings(USERS_PROFILE_CACHE=True, WEB_CONCURRENCY=2)
+    def test_profile_cache_process_local(self):
+        """ The profile cache refuses a local-memory cache when several worker processes
+        serve requests, as invalidations wouldn't reach the other processes
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            ProfileCache()
+
+
+class TestUserInviteState(TestCase):
+    """ Unit tests for the invite state denormalised from the invite groups
+    """
+
+    fixtures = ["dailywriting/fixtures/seed.json"]
+
+    def setUp(self):
+        self.test_user = UserModel.objects.create(
+            username="tester", email="tester@email.com"
+        )
+
+    def test_get_invite_group_ids(self):
+        """ Invite group ids are resolved once
+        """
+        group_ids = get_invite_group_ids()
+
+        self.assertEqual(
+            group_ids[UserModel.INVITE_INVITED], Group.objects.get(name="Invited").pk
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(get_invite_group_ids(), group_ids)
+
+    def test_set_invite_state(self):
+        """ Setting the invite state moves the user between the invite groups
+        """
+        self.test_user.set_invite_state(UserModel.INVITE_REQUESTED)
+        self.test_user.set_invite_state(UserModel.INVITE_INVITED)
+
+        self.assertEqual(
+            list(self.test_user.groups.values_list("name", flat=True)), ["Invited"]
+        )
+        self.assertEqual(
+            UserModel.objects.get(pk=self.test_user.pk).invite_state,
+            UserModel.INVITE_INVITED,
+        )
+
+    def test_group_changes_sync_invite_state(self):
+        """ Changes to invite group membership from either side update the invite state
+        """
+        invited = Group.objects.get(name="Invited")
+        accepted = Group.objects.get(name="Invite Accepted")
+
+        self.test_user.groups.add(invited)
+        self.assertEqual(self.test_user.invite_state, UserModel.INVITE_INVITED)
+
+        accepted.user_set.add(self.test_user)
+        self.test_user.refresh_from_db()
+        self.assertEqual(self.test_user.invite_state, UserModel.INVITE_ACCEPTED)
+
+        accepted.user_set.clear()
+        self.test_user.refresh_from_db()
+        self.assertEqual(self.test_user.invite_state, UserModel.INVITE_INVITED)
+
+        self.test_user.groups.clear()
+        self.assertEqual(self.test_user.invite_state, "")
@@ -1,12 +1,18 @@
+from unittest.mock import patch
+
 from allauth.account.models import EmailAddress, EmailConfirmationHMAC
+from api.mail import send_queued_mail
+from api.models import OutboundEmail
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.core import mail
+from django.core.cache import caches
 from rest_auth.views import LoginView, PasswordResetView
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from users.throttles import InviteRequestIPThrottle
 from users.views import InviteRequestAcceptanceView, InviteRequestView
 
 UserModel = get_user_model()
@@ -20,6 +26,8 @@ class TestInviteAPIViews(APITestCase):
     fixtures = ["dailywriting/fixtures/seed.json"]
 
     def setUp(self):
+        caches["shared"].clear()  # Invite request throttles
+        self.addCleanup(caches["shared"].clear)
         self.factory = APIRequestFactory()
         self.existing_user = UserModel.objects.create(
             username="tester", email="tester@test.com"
@@ -49,11 +57,80 @@ class TestInviteAPIViews(APITestCase):
         self.assertEqual(response.data, {"email": test_email})
         self.assertTrue(get_user_model().objects.filter(email=test_email).exists())
         self.assertTrue(EmailAddress.objects.filter(email=test_email).exists())
+        self.assertEqual(len(mail.outbox), 0)  # Queued rather than sent
+
+        send_queued_mail()
         self.assertEqual(mail.outbox[0].to, [test_email])
         self.assertEqual(
             mail.outbox[1].to, [admin_tuple[1] for admin_tuple in settings.ADMINS]
         )
 
+    def test_request_invite_repeated(self):
+        """ Repeat invite requests are answered the same without DB or email work
+        """
+        test_email = "new_tester@tester.com"
+        response = self.client.post(
+            path="/api/auth/registration/invite/",
+            data={"email": test_email},
+            format="json",
+        )
+        queued_emails = OutboundEmail.objects.count()
+
+        with self.assertNumQueries(0):
+            repeat_response = self.client.post(
+                path="/api/auth/registration/invite/",
+                data={"email": test_email.upper()},
+                format="json",
+            )
+
+        self.assertEqual(repeat_response.status_code, response.status_code)
+        self.assertEqual(repeat_response.data, {"email": test_email.upper()})
+        self.assertEqual(OutboundEmail.objects.count(), queued_emails)
+
+    @patch.dict(InviteRequestIPThrottle.THROTTLE_RATES, {"invite_request_ip": "1/hour"})
+    def test_request_invite_ip_throttled(self):
+        """ Invite requests beyond the rate allowed from an IP address are answered the same
+        """
+        self.client.post(
+            path="/api/auth/registration/invite/",
+            data={"email": "new_tester@tester.com"},
+            format="json",
+        )
+
+        response = self.client.post(
+            path="/api/auth/registration/invite/",
+            data={"email": "other_tester@tester.com"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"email": "other_tester@tester.com"})
+        self.assertFalse(
+            get_user_model().objects.filter(email="other_tester@tester.com").exists()
+        )
+
+    @patch.dict(InviteRequestIPThrottle.THROTTLE_RATES, {"invite_request_ip": "1/hour"})
+    def test_request_invite_ip_throttled_forwarded(self):
+        """ Forged X-Forwarded-For entries don't evade the rate allowed from an IP address
+        """
+        self.client.post(
+            path="/api/auth/registration/invite/",
+            data={"email": "new_tester@tester.com"},
+            format="json",
+            HTTP_X_FORWARDED_FOR="10.0.0.1, 192.0.2.1",
+        )
+
+        self.client.post(
+            path="/api/auth/registration/invite/",
+            data={"email": "other_tester@tester.com"},
+            format="json",
+            HTTP_X_FORWARDED_FOR="10.0.0.2, 192.0.2.1",
+        )
+
+        self.assertFalse(
+            get_user_model().objects.filter(email="other_tester@tester.com").exists()
+        )
+
     def test_request_invite_with_email_already_accepted(self):
         """ Request invite flow with email address associated with an existing request
 
@@ -77,6 +154,7 @@ class TestInviteAPIViews(APITestCase):
         # Response always successul to avoid exposing whether an account with the provided email exists (or not)
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.data, {"email": test_email})
+        send_queued_mail()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, "[Daily Writing] Account reminder")
 
@@ -120,6 +198,8 @@ class TestLoginAPIViews(APITestCase):
     fixtures = ["dailywriting/fixtures/seed.json"]
 
     def setUp(self):
+        caches["shared"].clear()  # Invite request throttles
+        self.addCleanup(caches["shared"].clear)
         self.factory = APIRequestFactory()
         self.existing_user = UserModel.objects.create(
             username="tester", email="tester@test.com"
@@ -304,3 +384,24 @@ class TestInviteRequestAcceptanceView(APITestCase):
         )
         self.assertTrue(self.test_user.groups.filter(name="Invited").exists())
         self.assertFalse(self.test_user.groups.filter(name="Invite Accepted").exists())
+
+    def test_post_queries(self):
+        """ Post invite acceptance resolves the token once within a fixed query budget
+        """
+        self.test_user.groups.add(Group.objects.get(name="Invited"))
+        test_token = EmailConfirmationHMAC(self.test_email_address).key
+
+        test_data = {
+            "token": test_token,
+            "username": self.test_user.username,
+            "password": "#@$faXPEf24432d",
+        }
+        factory = APIRequestFactory()
+        request = factory.post(f"auth/registration/invite/{test_token}/", test_data)
+
+        view = InviteRequestAcceptanceView.as_view()
+        # 1 to resolve the token's email address and user, 4 for allauth to confirm the
+        # email address, 1 to save the user and 3 to move them to Invite Accepted
+        with self.assertNumQueries(9):
+            response = view(request, token=test_token, data=test_data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
@@ -0,0 +1,44 @@
+import hashlib
+
+from api.caches import SHARED_CACHE_ALIAS
+from django.core.cache import caches
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle
+
+
+class SharedCacheThrottleMixin:
+    """
+    Counts requests in the shared cache (settings.CACHES["shared"]) so that rates
+    hold across worker processes. While the shared cache is the local-memory backend
+    each process counts separately, allowing up to WEB_CONCURRENCY times the rate.
+    """
+
+    @property
+    def cache(self):
+        return caches[SHARED_CACHE_ALIAS]
+
+
+class InviteRequestIPThrottle(SharedCacheThrottleMixin, AnonRateThrottle):
+    """
+    Limits the rate of invite requests from a client IP address
+
+    The address is taken from X-Forwarded-For as appended by the trusted proxies
+    (settings.REST_FRAMEWORK["NUM_PROXIES"]), so clients can't forge it.
+    """
+
+    scope = "invite_request_ip"
+
+
+class InviteRequestEmailThrottle(SharedCacheThrottleMixin, SimpleRateThrottle):
+    """
+    Limits the rate of invite requests for an email address, normalised so that case
+    and surrounding whitespace variations count as repeats
+    """
+
+    scope = "invite_request_email"
+
+    def get_cache_key(self, request, view):
+        email = str(request.data.get("email", "")).strip().lower()
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": hashlib.sha256(email.encode("utf-8")).hexdigest(),
+        }
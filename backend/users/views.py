@@ -1,7 +1,7 @@
 import json
-import logging
 
 from allauth.account.models import EmailConfirmationHMAC
+from django.contrib.auth import get_user_model
 from rest_auth.registration.views import RegisterView
 from rest_auth.views import PasswordResetView
 from rest_framework import status
@@ -19,17 +19,37 @@ from users.serializers import (
     InviteRequestSerializer,
     InviteTokenSerializer,
 )
-
-logger = logging.getLogger(__name__)
+from users.throttles import InviteRequestEmailThrottle, InviteRequestIPThrottle
 
 
 class InviteRequestView(RegisterView):
+    """
+    Invite request
+
+    Repeat requests for an email address, or requests beyond the rate allowed from a
+    client IP, are answered as usual without any database or email work (see
+    `invite_request_throttle_classes`).
+    """
+
     serializer_class = InviteRequestSerializer
+    invite_request_throttle_classes = (
+        InviteRequestIPThrottle,
+        InviteRequestEmailThrottle,
+    )
 
     def get_response_data(self, user):
         return {"email": user.email}
 
+    def allow_invite_request(self):
+        return all(
+            throttle().allow_request(self.request, self)
+            for throttle in self.invite_request_throttle_classes
+        )
+
     def perform_create(self, serializer):
+        if not self.allow_invite_request():
+            # Respond as if the request was processed, see `get_response_data`
+            return get_user_model()(email=serializer.validated_data["email"])
         user = serializer.save(self.request)
         return user
 
@@ -63,13 +83,7 @@ class DailyWritingProfileView(RetrieveUpdateAPIView):
     model_class = DailyWritingProfile
 
     def get_object(self):
-        profile, created = self.model_class.objects.get_or_create(
-            user=self.request.user
-        )
-        if created:
-            # Shouldn't occur: See users.models.create_or_update_user_profile signal
-            logger.exception("Authenticated user profile missing!?")
-        return profile
+        return self.model_class.objects.get_for_user(self.request.user)
 
 
 class DailyWritingPasswordResetView(PasswordResetView):
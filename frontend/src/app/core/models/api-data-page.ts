@@ -1,5 +1,5 @@
 export class ApiDataPage {
-  count: number;
+  count?: number;
   next?: string;
   previous?: string;
   results: any[];